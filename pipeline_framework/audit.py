@@ -7,12 +7,11 @@ Teams replace the import line with their specific audit implementation.
 
 # TEAM CUSTOMIZATION: Replace this import with your audit implementation
 from pipeline_framework.audit_operations import audit_data_transfer
-from pipeline_framework.utils.time_utils import get_current_time_iso
-from pipeline_framework.utils.log_generator import setup_pipeline_logger
+from pipeline_framework.utils.lazy_logger import LazyPipelineLogger
 from pipeline_framework.utils.time_utility import get_current_time_iso
 from pipeline_framework.drive_record_adapter import update_record_in_drive_table
 
-log = setup_pipeline_logger(logger_name="Audit")
+log = LazyPipelineLogger("Audit")
 
 def audit(final_config, record):
    """Audit data transfer with phase management."""
@@ -5,12 +5,12 @@ from typing import Dict, Any, Tuple
 from pipeline_framework.source import count as source_count
 from pipeline_framework.target import count as target_count, delete as target_delete
 from pipeline_framework.stage import delete as stage_delete
-from pipeline_framework.utils.log_generator import setup_pipeline_logger
-from pipeline_framework.utils.time_utils import get_current_time_iso
+from pipeline_framework.utils.lazy_logger import LazyPipelineLogger
+from pipeline_framework.utils.time_utility import get_current_time_iso
 from pipeline_framework.drive_record_adapter import update_record_in_drive_table
 
 
-log = setup_pipeline_logger(logger_name="AuditOps")
+log = LazyPipelineLogger("AuditOps")
 
 
 
@@ -29,8 +29,8 @@ def reset_record_for_retry(record: Dict[str, Any]) -> None:
     
     # Reset source to stage
     record['SOURCE_TO_STAGE_INGESTION_STATUS'] = 'PENDING'
-    record['STAGE_TO_STAGE_INGESTION_START_TIME'] = None
-    record['STAGE_TO_TARGET_INGESTION_END_TIME'] = None
+    record['SOURCE_TO_STAGE_INGESTION_START_TIME'] = None
+    record['SOURCE_TO_STAGE_INGESTION_END_TIME'] = None
     
     # Reset stage to target
     record['STAGE_TO_TARGET_INGESTION_STATUS'] = 'PENDING'
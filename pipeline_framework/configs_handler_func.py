@@ -1,9 +1,10 @@
 # pipeline_framework/simple_config_handler.py
+import copy
+import functools
 import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from airflow.models import Variable
-from pathlib import Path
 
 
 def load_json_file(file_path: str) -> Dict[str, Any]:
@@ -94,27 +95,64 @@ def update_drive_table_keys_only(drive_table: Dict[str, Any], updated_config: Di
 
 
 
+def _resolve_config_paths(root_project_path: str, team_config_relative_path: str, drive_template_relative_path: str) -> Tuple[str, str]:
+    """Absolute (team config, drive template) paths under the canonical project root"""
+    root_project_path = os.path.realpath(root_project_path)
+    abs_config_path = os.path.join(root_project_path, team_config_relative_path.strip('/'))
+    abs_drive_template_path = os.path.join(root_project_path, drive_template_relative_path.strip('/'))
+    return abs_config_path, abs_drive_template_path
+
+
 def get_final_config(root_project_path: str, team_config_relative_path: str, drive_template_relative_path: str) -> Dict[str, Any]:
     """Complete config merging with placeholder replacement"""
     
     # Build absolute paths
-    root_project_path = Path(root_project_path.strip('/'))
-    team_config_relative_path = Path(team_config_relative_path.strip('/'))
-    drive_template_relative_path = Path(drive_template_relative_path.strip('/'))
-
-    abs_config_path = root_project_path / team_config_relative_path
-    abs_drive_template_path = str(root_project_path / drive_template_relative_path)
+    abs_config_path, abs_drive_template_path = _resolve_config_paths(
+        root_project_path, team_config_relative_path, drive_template_relative_path
+    )
 
     # Step 1: Load team config
     team_config = load_json_file(abs_config_path)
     drive_config = load_json_file(abs_drive_template_path)
     print(f" Loaded team config: {len(team_config)} keys")
 
-    updated_config = update_default_config_with_airflow_vars(team_config)
+    return _merge_final_config(team_config, drive_config)
+
+
+def _merge_final_config(team_config: Dict[str, Any], drive_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Overlay Airflow variables on the team config and fill the drive table template from it (mutates team_config)"""
+    final_config = update_default_config_with_airflow_vars(team_config)
 
-    updated_drive_config = update_drive_table_keys_only(drive_config, updated_config)
+    updated_drive_config = update_drive_table_keys_only(drive_config, final_config)
 
     final_config["drive_table_default_record"] = updated_drive_config
     
     print(f"Final config ready: {len(final_config)} keys")
-    return final_config
\ No newline at end of file
+    return final_config
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_config_files(abs_config_path: str, abs_drive_template_path: str,
+                         team_config_mtime: float, drive_template_mtime: float) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Parsed (team config, drive template) JSON memoized per paths; the mtimes in the key force a reload when either file changes"""
+    team_config = load_json_file(abs_config_path)
+    drive_config = load_json_file(abs_drive_template_path)
+    print(f" Loaded team config: {len(team_config)} keys")
+    return team_config, drive_config
+
+
+def get_cached_final_config(root_project_path: str, team_config_relative_path: str, drive_template_relative_path: str) -> Dict[str, Any]:
+    """
+    get_final_config for DAG-parse time: the JSON files are only re-read when one of them changed.
+    Airflow variables are not part of the cache and are fetched and merged on every call.
+    """
+    abs_config_path, abs_drive_template_path = _resolve_config_paths(
+        root_project_path, team_config_relative_path, drive_template_relative_path
+    )
+    team_config, drive_config = _cached_config_files(
+        abs_config_path,
+        abs_drive_template_path,
+        os.path.getmtime(abs_config_path),
+        os.path.getmtime(abs_drive_template_path)
+    )
+    return _merge_final_config(copy.deepcopy(team_config), copy.deepcopy(drive_config))
@@ -1,12 +1,16 @@
 # storage_adapters/drive_record_adapter.py
 
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pipeline_framework.utils.snowflake_utils import SnowflakeQueryClient
-from pipeline_framework.utils.log_generator import setup_pipeline_logger
-import pandas as pd
-from pipeline_framework.utils.time_utils import get_current_time_iso
-log = setup_pipeline_logger(logger_name="DriveRecordAdapter")
+from pipeline_framework.utils.lazy_logger import LazyPipelineLogger
+from pipeline_framework.utils.time_utility import get_current_time_iso
+log = LazyPipelineLogger("DriveRecordAdapter")
+
+
+def _drive_table_name(final_config: Dict[str, Any]) -> str:
+    """Fully qualified drive table name"""
+    return f"{final_config['drive_database']}.{final_config['drive_schema']}.{final_config['drive_table']}"
 
 
 def get_existing_drive_records(final_config: Dict[str, Any], TARGET_DAY: str) -> Optional[str]:
@@ -98,17 +102,23 @@ def get_existing_drive_records(final_config: Dict[str, Any], TARGET_DAY: str) ->
         raise
 
 
-def insert_drive_record(record: Dict[str, Any], final_config: Dict[str, Any]) -> None:
+def insert_drive_records(records: List[Dict[str, Any]], final_config: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Insert drive record into Snowflake table.
+    Insert drive records into Snowflake table with a single multi-row INSERT.
     
     Args:
-        record: Complete record dictionary with all 32 fields
+        records: Complete record dictionaries, all with the same fields
         final_config: Configuration containing Snowflake connection details
+        
+    Returns:
+        Dict with query_id and rows_affected
     """
+    if not records:
+        return {"query_id": None, "rows_affected": 0}
+    
     try:
         log.info(
-            f"Inserting drive record: {record.get('PIPELINE_ID', 'unknown')}",
+            f"Inserting {len(records)} drive records",
             log_key="Drive Record Insert",
             status="STARTED"
         )
@@ -128,31 +138,42 @@ def insert_drive_record(record: Dict[str, Any], final_config: Dict[str, Any]) ->
             'table': final_config['drive_table']
         }
         
-        # Handle miscellaneous field as JSON
-        record_copy = record.copy()
-        # use_parse_json = False
-
-        # if record_copy.get('miscellaneous') is not None:
-        #     if isinstance(record_copy['miscellaneous'], dict):
-        #         record_copy['miscellaneous'] = json.dumps(record_copy['miscellaneous'])
-        #         use_parse_json = True
-        #     elif isinstance(record_copy['miscellaneous'], str):
-        #         use_parse_json = True  # Assume it's already JSON string
-
-        # # Build INSERT query
-        # for field in field_names:
-        #     if field == 'miscellaneous' and use_parse_json:
-        #         field_placeholders.append(f"PARSE_JSON(%({field})s)")
-        #     else:
-        #         field_placeholders.append(f"%({field})s")
+        # One VALUES tuple per record; params are namespaced per row.
+        # Dict/list values (e.g. MISCELLANEOUS) are bound as JSON text and parsed back with
+        # PARSE_JSON, which Snowflake only accepts in a SELECT list - hence INSERT ... SELECT ... FROM VALUES
+        columns = list(records[0].keys())
+        json_columns = {
+            column for column in columns
+            if any(isinstance(record[column], (dict, list)) for record in records)
+        }
+        params = {}
+        value_rows = []
+        for row_index, record in enumerate(records):
+            placeholders = []
+            for col_index, column in enumerate(columns):
+                param_key = f"r{row_index}_c{col_index}"
+                value = record[column]
+                params[param_key] = json.dumps(value) if isinstance(value, (dict, list)) else value
+                placeholders.append(f"%({param_key})s")
+            value_rows.append(f"({', '.join(placeholders)})")
+        
+        select_list = [
+            f"PARSE_JSON(${position})" if column in json_columns else f"${position}"
+            for position, column in enumerate(columns, start=1)
+        ]
+        
+        query = f"""
+        INSERT INTO {snowflake_config['database']}.{snowflake_config['schema']}.{snowflake_config['table']}
+        ({', '.join(columns)})
+        SELECT {', '.join(select_list)}
+        FROM VALUES {', '.join(value_rows)}
+        """
         
-
-                
         with SnowflakeQueryClient(snowflake_creds, snowflake_config) as sf_client:
-            result = sf_client.insert_one_record_only(record_copy)
+            result = sf_client.execute_dml_query(query, params)
 
             log.info(
-                "Drive record inserted successfully",
+                "Drive records inserted successfully",
                 log_key="Drive Record Insert",
                 status="SUCCESS",
                 query_id=result['query_id'],
@@ -162,15 +183,32 @@ def insert_drive_record(record: Dict[str, Any], final_config: Dict[str, Any]) ->
             
     except Exception as e:
         log.exception(
-            "Error inserting drive record",
+            "Error inserting drive records",
             log_key="Drive Record Insert",
             status="ERROR"
         )
         raise
 
 
+def insert_drive_record(record: Dict[str, Any], final_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Insert one drive record into Snowflake table.
+    
+    Args:
+        record: Complete record dictionary with all 32 fields
+        final_config: Configuration containing Snowflake connection details
+    """
+    return insert_drive_records([record], final_config)
+
+
 def cleanup_stale_locks(final_config: Dict[str, Any], stale_hours: int = 2) -> int:
-    """Clean up stale locks based on PIPELINE_STATUS and duration"""
+    """
+    Clean up stale locks based on PIPELINE_STATUS and duration.
+    
+    Idempotent: the single UPDATE only matches IN_PROGRESS rows and moves them to
+    PENDING, so re-running it (task retries, all_done reruns) resets nothing twice
+    and simply returns 0.
+    """
     try:
         log.info(f"Starting stale lock cleanup for duration > {stale_hours} hours",
                 log_key="Stale Lock Cleanup", status="STARTED")
@@ -189,13 +227,26 @@ def cleanup_stale_locks(final_config: Dict[str, Any], stale_hours: int = 2) -> i
             'table': final_config['drive_table']
         }
         
-        # Find stale records: IN_PROGRESS + DAG_RUN_ID + duration check
+        # Reset stale records in one statement: IN_PROGRESS + DAG_RUN_ID + duration check.
+        # Pipeline-level fields are always cleared; each phase is reset only if it had not
+        # COMPLETED (SET expressions see the pre-update row, so the IFFs read the old status).
         query = f"""
-        SELECT PIPELINE_ID, DAG_RUN_ID, PIPELINE_START_TIME,
-               SOURCE_TO_STAGE_INGESTION_STATUS,
-               STAGE_TO_TARGET_INGESTION_STATUS,
-               AUDIT_STATUS
-        FROM {snowflake_config['database']}.{snowflake_config['schema']}.{snowflake_config['table']}
+        UPDATE {snowflake_config['database']}.{snowflake_config['schema']}.{snowflake_config['table']}
+        SET PIPELINE_STATUS = 'PENDING',
+            PIPELINE_START_TIME = NULL,
+            PIPELINE_END_TIME = NULL,
+            DAG_RUN_ID = NULL,
+            COMPLETED_PHASE = NULL,
+            SOURCE_TO_STAGE_INGESTION_STATUS = IFF(SOURCE_TO_STAGE_INGESTION_STATUS = 'COMPLETED', 'COMPLETED', 'PENDING'),
+            SOURCE_TO_STAGE_INGESTION_START_TIME = IFF(SOURCE_TO_STAGE_INGESTION_STATUS = 'COMPLETED', SOURCE_TO_STAGE_INGESTION_START_TIME, NULL),
+            SOURCE_TO_STAGE_INGESTION_END_TIME = IFF(SOURCE_TO_STAGE_INGESTION_STATUS = 'COMPLETED', SOURCE_TO_STAGE_INGESTION_END_TIME, NULL),
+            STAGE_TO_TARGET_INGESTION_STATUS = IFF(STAGE_TO_TARGET_INGESTION_STATUS = 'COMPLETED', 'COMPLETED', 'PENDING'),
+            STAGE_TO_TARGET_INGESTION_START_TIME = IFF(STAGE_TO_TARGET_INGESTION_STATUS = 'COMPLETED', STAGE_TO_TARGET_INGESTION_START_TIME, NULL),
+            STAGE_TO_TARGET_INGESTION_END_TIME = IFF(STAGE_TO_TARGET_INGESTION_STATUS = 'COMPLETED', STAGE_TO_TARGET_INGESTION_END_TIME, NULL),
+            AUDIT_STATUS = IFF(AUDIT_STATUS = 'COMPLETED', 'COMPLETED', 'PENDING'),
+            AUDIT_START_TIME = IFF(AUDIT_STATUS = 'COMPLETED', AUDIT_START_TIME, NULL),
+            AUDIT_END_TIME = IFF(AUDIT_STATUS = 'COMPLETED', AUDIT_END_TIME, NULL),
+            AUDIT_RESULT = IFF(AUDIT_STATUS = 'COMPLETED', AUDIT_RESULT, NULL)
         WHERE PIPELINE_STATUS = 'IN_PROGRESS'
           AND DAG_RUN_ID IS NOT NULL
           AND PIPELINE_START_TIME IS NOT NULL
@@ -203,58 +254,15 @@ def cleanup_stale_locks(final_config: Dict[str, Any], stale_hours: int = 2) -> i
         """
         
         with SnowflakeQueryClient(snowflake_creds, snowflake_config) as client:
-            result = client.fetch_all_rows_as_tuples(query, {'stale_hours': stale_hours})
-            stale_records = result['data']
+            result = client.execute_dml_query(query, {'stale_hours': stale_hours})
+            cleaned_count = result['rows_affected']
             
-            if not stale_records:
+            if not cleaned_count:
                 log.info("No stale locks found", log_key="Stale Lock Cleanup", status="NO_STALE_LOCKS")
                 return 0
             
-            # Reset each stale record
-            cleaned_count = 0
-            for record_tuple in stale_records:
-                PIPELINE_ID, DAG_RUN_ID, PIPELINE_START_TIME, SOURCE_TO_STAGE_INGESTION_STATUS, STAGE_TO_TARGET_INGESTION_STATUS, AUDIT_STATUS = record_tuple
-
-                log.warning(f"Cleaning stale lock: PIPELINE_ID={PIPELINE_ID}, duration exceeded",
-                           log_key="Stale Lock Cleanup", status="CLEANING")
-                
-                # Reset pipeline level
-                reset_fields = {
-                    'PIPELINE_STATUS': 'PENDING',
-                    'PIPELINE_START_TIME': None,
-                    'PIPELINE_END_TIME': None,
-                    'DAG_RUN_ID': None,
-                    'COMPLETED_PHASE': None
-                }
-                
-                # Reset incomplete phases only
-                if s2s_status != 'COMPLETED':
-                    reset_fields.update({
-                        'SOURCE_TO_STAGE_INGESTION_STATUS': 'PENDING',
-                        'SOURCE_TO_STAGE_INGESTION_START_TIME': None,
-                        'SOURCE_TO_STAGE_INGESTION_END_TIME': None
-                    })
-                
-                if s2t_status != 'COMPLETED':
-                    reset_fields.update({
-                        'STAGE_TO_TARGET_INGESTION_STATUS': 'PENDING',
-                        'STAGE_TO_TARGET_INGESTION_START_TIME': None,
-                        'STAGE_TO_TARGET_INGESTION_END_TIME': None
-                    })
-                
-                if AUDIT_STATUS != 'COMPLETED':
-                    reset_fields.update({
-                        'AUDIT_STATUS': 'PENDING',
-                        'AUDIT_START_TIME': None,
-                        'AUDIT_END_TIME': None,
-                        'AUDIT_RESULT': None
-                    })
-                
-                update_record_fields(PIPELINE_ID, reset_fields, final_config)
-                cleaned_count += 1
-            
             log.info(f"Cleaned up {cleaned_count} stale locks",
-                    log_key="Stale Lock Cleanup", status="SUCCESS")
+                    log_key="Stale Lock Cleanup", status="SUCCESS", query_id=result['query_id'])
             return cleaned_count
             
     except Exception as e:
@@ -318,11 +326,76 @@ def update_record_fields(PIPELINE_ID: str, fields_to_update: Dict[str, Any], fin
         raise
 
 
-def update_record_in_drive_table(record: Dict[str, Any], final_config: Dict[str, Any]) -> None:
+def lock_record_for_processing(PIPELINE_ID: str, DAG_RUN_ID: str, final_config: Dict[str, Any],
+                               PIPELINE_START_TIME: Optional[str] = None) -> bool:
+    """
+    Atomically claim a PENDING drive record for a DAG run.
+
+    Args:
+        PIPELINE_ID: Unique identifier for the pipeline record.
+        DAG_RUN_ID: DAG run taking the lock.
+        final_config: Configuration dict with Snowflake credentials and table info.
+        PIPELINE_START_TIME: Lock timestamp, defaults to now in the configured timezone.
+
+    Returns:
+        True if this run acquired the lock, False if the record was no longer PENDING.
+    """
+    try:
+        if PIPELINE_START_TIME is None:
+            PIPELINE_START_TIME = get_current_time_iso(final_config.get('timezone', 'UTC'))
+
+        snowflake_creds = {
+            'account': final_config['snowflake_account'],
+            'user': final_config['snowflake_user'],
+            'password': final_config['snowflake_password'],
+            'role': final_config['snowflake_role'],
+            'warehouse': final_config['snowflake_warehouse']
+        }
+
+        snowflake_config = {
+            'database': final_config['drive_database'],
+            'schema': final_config['drive_schema'],
+            'table': final_config['drive_table']
+        }
+
+        # Conditional on the current status, so only one of several concurrent pickers matches the row
+        query = f"""
+        UPDATE {snowflake_config['database']}.{snowflake_config['schema']}.{snowflake_config['table']}
+        SET PIPELINE_STATUS = 'IN_PROGRESS',
+            DAG_RUN_ID = %(DAG_RUN_ID)s,
+            PIPELINE_START_TIME = %(PIPELINE_START_TIME)s
+        WHERE PIPELINE_ID = %(PIPELINE_ID)s
+          AND PIPELINE_STATUS = 'PENDING'
+        """
+
+        params = {
+            'PIPELINE_ID': PIPELINE_ID,
+            'DAG_RUN_ID': DAG_RUN_ID,
+            'PIPELINE_START_TIME': PIPELINE_START_TIME
+        }
+
+        with SnowflakeQueryClient(snowflake_creds, snowflake_config) as client:
+            result = client.execute_dml_query(query, params)
+
+        acquired = result['rows_affected'] == 1
+        log.info("Record lock acquired" if acquired else "Record lock lost to another run",
+                 log_key="Drive Record Lock",
+                 status="LOCKED" if acquired else "LOST_RACE",
+                 PIPELINE_ID=PIPELINE_ID,
+                 query_id=result['query_id'])
+        return acquired
+
+    except Exception as e:
+        log.exception("Error locking drive record", log_key="Drive Record Lock", status="ERROR", PIPELINE_ID=PIPELINE_ID)
+        raise
+
+
+def update_record_in_drive_table(record: Dict[str, Any], final_config: Dict[str, Any], current_time_iso: Optional[str] = None) -> None:
     """Update record in drive table/central location"""
     try:
-        timezone = final_config.get('timezone', 'UTC')
-        record['RECORD_LAST_UPDATED_TIME'] = get_current_time_iso(timezone)
+        if current_time_iso is None:
+            current_time_iso = get_current_time_iso(final_config.get('timezone', 'UTC'))
+        record['RECORD_LAST_UPDATED_TIME'] = current_time_iso
 
         update_record_fields(
             PIPELINE_ID=record['PIPELINE_ID'],
@@ -338,6 +411,21 @@ def update_record_in_drive_table(record: Dict[str, Any], final_config: Dict[str,
 
 
 
+def finalize_record(record: Dict[str, Any], final_config: Dict[str, Any], updates: Dict[str, Any], current_time_iso: Optional[str] = None) -> None:
+    """
+    Apply the final field updates of a transfer attempt and persist them with a single drive table write.
+    
+    Args:
+        record: Drive record being processed (updated in place)
+        final_config: Configuration dict with Snowflake credentials and table info
+        updates: Fields to set on the record; RECORD_LAST_UPDATED_TIME is stamped automatically
+        current_time_iso: Timestamp to stamp, defaults to now in the configured timezone
+    """
+    record.update(updates)
+    update_record_in_drive_table(record, final_config, current_time_iso=current_time_iso)
+
+
+
 def get_oldest_pending_record(final_config: Dict[str, Any], PIPELINE_PRIORITY: str) -> Optional[Dict[str, Any]]:
     query = f"""
     SELECT * FROM {final_config['drive_database']}.{final_config['drive_schema']}.{final_config['drive_table']}
@@ -346,6 +434,7 @@ def get_oldest_pending_record(final_config: Dict[str, Any], PIPELINE_PRIORITY: s
       AND SOURCE_CATEGORY = %(SOURCE_CATEGORY)s
       AND SOURCE_SUB_CATEGORY = %(SOURCE_SUB_CATEGORY)s
       AND PIPELINE_PRIORITY = %(PIPELINE_PRIORITY)s
+      AND WINDOW_START_TIME <= CURRENT_TIMESTAMP()
     ORDER BY WINDOW_START_TIME ASC
     LIMIT 1
     """
@@ -378,6 +467,39 @@ def get_oldest_pending_record(final_config: Dict[str, Any], PIPELINE_PRIORITY: s
         return None
 
 
+def fetch_record(PIPELINE_ID: str, final_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Get a drive record by PIPELINE_ID, read from Snowflake on every call.
+
+    Args:
+        PIPELINE_ID: Unique identifier for the pipeline record.
+        final_config: Configuration dict with Snowflake credentials and table info.
 
+    Returns:
+        The record as a dict or None if it does not exist.
+    """
+    query = f"""
+    SELECT * FROM {_drive_table_name(final_config)}
+    WHERE PIPELINE_ID = %(PIPELINE_ID)s
+    LIMIT 1
+    """
+    snowflake_creds = {
+        'account': final_config['snowflake_account'],
+        'user': final_config['snowflake_user'],
+        'password': final_config['snowflake_password'],
+        'role': final_config['snowflake_role'],
+        'warehouse': final_config['snowflake_warehouse']
+    }
 
+    snowflake_config = {
+        'database': final_config['drive_database'],
+        'schema': final_config['drive_schema'],
+        'table': final_config['drive_table']
+    }
 
+    with SnowflakeQueryClient(snowflake_creds, snowflake_config) as client:
+        result = client.fetch_all_rows_as_dataframe(query, {'PIPELINE_ID': PIPELINE_ID})
+        df = result.get('data')
+        if df is None or df.empty:
+            return None
+        return df.iloc[0].to_dict()
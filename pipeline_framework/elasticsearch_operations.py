@@ -11,9 +11,9 @@ from elasticsearch.exceptions import (
     RequestError
 )
 
-from pipeline_framework.utils.log_generator import setup_pipeline_logger
+from pipeline_framework.utils.lazy_logger import LazyPipelineLogger
 
-log = setup_pipeline_logger(logger_name="ElasticsearchOps")
+log = LazyPipelineLogger("ElasticsearchOps")
 
 
 def elasticsearch_connection(final_config: Dict[str, Any]) -> Elasticsearch:
@@ -66,8 +66,8 @@ def elasticsearch_count(final_config: Dict[str, Any], record: Dict[str, Any]) ->
         es_format = final_config.get('es_format', 'iso')
         timezone = final_config.get('timezone', 'UTC')
         # Ensure timestamps are proper ISO strings
-        start_time = to_elasticsearch_format(record['window_start_time'], es_format, timezone)
-        end_time = to_elasticsearch_format(record['window_end_time'], es_format, timezone)
+        start_time = to_elasticsearch_format(record['WINDOW_START_TIME'], es_format, timezone)
+        end_time = to_elasticsearch_format(record['WINDOW_END_TIME'], es_format, timezone)
 
         # Build proper query with bool/must structure
         query = {
@@ -3,10 +3,10 @@
 import subprocess
 import json
 from typing import Dict, Any
-from pipeline_framework.utils.log_generator import setup_pipeline_logger
+from pipeline_framework.utils.lazy_logger import LazyPipelineLogger
 from pipeline_framework.utils.time_utility import to_elasticsearch_format, get_current_epoch_time
 
-log = setup_pipeline_logger(logger_name="ElasticsearchToS3")
+log = LazyPipelineLogger("ElasticsearchToS3")
 
 def build_elasticdump_command(final_config: Dict[str, Any], record: Dict[str, Any]) -> list:
     """Build elasticdump command with configurable parameters"""
@@ -16,8 +16,8 @@ def build_elasticdump_command(final_config: Dict[str, Any], record: Dict[str, An
     timezone = final_config.get('timezone', 'UTC')
 
     # Convert timestamps to ES format with timezone
-    start_time = to_elasticsearch_format(record['window_start_time'], es_format, timezone)
-    end_time = to_elasticsearch_format(record['window_end_time'], es_format, timezone)
+    start_time = to_elasticsearch_format(record['WINDOW_START_TIME'], es_format, timezone)
+    end_time = to_elasticsearch_format(record['WINDOW_END_TIME'], es_format, timezone)
     
     # Build query
     search_body = {
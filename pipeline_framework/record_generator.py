@@ -12,14 +12,14 @@ RECORD GENERATOR FLOW:
 8. If start_time >= TARGET_DAY_end: return 0 (no record created)
 9. Create record from drive_table_default_record template
 10. Update with time fields and generate unique IDs
-11. Insert record and return 1
+11. Repeat 6-10 from end_time for up to records_per_run windows (default 1)
+12. Insert all records in one statement and return the count
 """
 
 import re
 import pendulum
 import hashlib
-import pandas as pd
-from pipeline_framework.utils.log_generator import setup_pipeline_logger
+from pipeline_framework.utils.lazy_logger import LazyPipelineLogger
 from pipeline_framework.utils.time_utility import (
     get_current_time_iso,
     to_iso_string,
@@ -35,10 +35,14 @@ from pipeline_framework.source import count as source_count
 from pipeline_framework.target import count as target_count
 
 from airflow.exceptions import AirflowSkipException
-from pipeline_framework.drive_record_adapter import get_existing_drive_records, insert_drive_record
+from pipeline_framework.drive_record_adapter import get_existing_drive_records, insert_drive_records
 
 # Setup logger for this module
-log = setup_pipeline_logger(logger_name="RecordGenerator")
+log = LazyPipelineLogger("RecordGenerator")
+
+
+_TIME_TOKEN_PATTERN = re.compile(r'(\d+)([wdhms])')
+_UNIT_SECONDS = {'w': 7 * 24 * 3600, 'd': 24 * 3600, 'h': 3600, 'm': 60, 's': 1}
 
 
 def parse_time_string(time_str):
@@ -46,26 +50,24 @@ def parse_time_string(time_str):
     if not time_str:
         return 0
     
-    pattern = r'(\d+)([wdhms])'
-    matches = re.findall(pattern, time_str.lower())
-    
     total_seconds = 0
-    for value, unit in matches:
-        value = int(value)
-        if unit == 'w':
-            total_seconds += value * 7 * 24 * 3600
-        elif unit == 'd':
-            total_seconds += value * 24 * 3600
-        elif unit == 'h':
-            total_seconds += value * 3600
-        elif unit == 'm':
-            total_seconds += value * 60
-        elif unit == 's':
-            total_seconds += value
+    for value, unit in _TIME_TOKEN_PATTERN.findall(time_str.lower()):
+        total_seconds += int(value) * _UNIT_SECONDS[unit]
     
     return total_seconds
 
 
+def parse_time_strings(time_strs):
+    """Parse a batch of time strings into total seconds, parsing each distinct string only once"""
+    parsed = {}
+    results = []
+    for time_str in time_strs:
+        if time_str not in parsed:
+            parsed[time_str] = parse_time_string(time_str)
+        results.append(parsed[time_str])
+    return results
+
+
 def seconds_to_time_string(total_seconds):
     """Convert seconds back to time string format like '1d2h30m'"""
     if total_seconds == 0:
@@ -97,24 +99,33 @@ def create_base_record(final_config):
     return record
 
 
-def update_time_fields(record, start_time_iso, end_time_iso, TARGET_DAY, final_config):
+def build_stage_uri(final_config, TARGET_DAY, hour_min):
+    """
+    s3://<bucket>/<prefix parts>/<TARGET_DAY>/<HH-mm>/ for one window.
+    Parts are joined without empty segments and the URI always ends with '/',
+    so S3 listings of the window stay scoped to its own "directory".
+    """
+    parts = [part.strip('/') for part in final_config["s3_prefix_list"]] + [TARGET_DAY, hour_min]
+    s3_uri = f"s3://{final_config['s3_bucket']}/" + '/'.join(part for part in parts if part) + '/'
+    return s3_uri
+
+
+def update_time_fields(record, start_time_iso, end_time_iso, TARGET_DAY, final_config, current_time_iso=None):
     """Update record with time-related fields (all as ISO strings)"""
     timezone = final_config["timezone"]
-    current_time = get_current_time_iso(timezone)
+    current_time = current_time_iso if current_time_iso is not None else get_current_time_iso(timezone)
     
     # Parse time window for hour-minute formatting
     start_dt = pendulum.parse(start_time_iso)
     hour_min = start_dt.format('HH-mm')
 
     # Build S3 path components
-    s3_prefix_list = final_config["s3_prefix_list"]
-    s3_prefix_subpath = '/'.join(s3_prefix_list)
-    s3_uri = f"s3://{final_config['s3_bucket']}/{s3_prefix_subpath}/{TARGET_DAY}/{hour_min}/"
+    s3_uri = build_stage_uri(final_config, TARGET_DAY, hour_min)
 
 
     # Calculate actual granularity achieved
     actual_duration_seconds = calculate_duration_seconds(start_time_iso, end_time_iso)
-    record['granularity'] = seconds_to_time_string(actual_duration_seconds)
+    record['GRANULARITY'] = seconds_to_time_string(actual_duration_seconds)
     record.update({
     'WINDOW_START_TIME': start_time_iso,
     'WINDOW_END_TIME': end_time_iso,
@@ -137,28 +148,48 @@ def update_time_fields(record, start_time_iso, end_time_iso, TARGET_DAY, final_c
     return record
 
 
+def _short_hash(payload):
+    """Return a 16-hex-char (64-bit) digest of the payload bytes"""
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
 def generate_pipeline_id(record, final_config):
     """Generate unique IDs using name/category/subcategory + time window"""
     
-    # Get time window strings for ID generation
-    window_start_str = record['WINDOW_START_TIME']
-    window_end_str = record['WINDOW_END_TIME']
+    # Encode time window strings once; they are shared by all three hash inputs
+    window_start_bytes = record['WINDOW_START_TIME'].encode()
+    window_end_bytes = record['WINDOW_END_TIME'].encode()
+    sep = b'*'
     
     # Generate SOURCE_ID
-    source_hash_input = f"{record.get('SOURCE_NAME', 'unknown')}*{record.get('SOURCE_CATEGORY', '')}*{record.get('SOURCE_SUB_CATEGORY', '')}*{window_start_str}*{window_end_str}"
-    SOURCE_ID = hashlib.md5(source_hash_input.encode()).hexdigest()[:16]
+    SOURCE_ID = _short_hash(sep.join([
+        str(record.get('SOURCE_NAME', 'unknown')).encode(),
+        str(record.get('SOURCE_CATEGORY', '')).encode(),
+        str(record.get('SOURCE_SUB_CATEGORY', '')).encode(),
+        window_start_bytes,
+        window_end_bytes
+    ]))
     
     # Generate STAGE_ID  
-    stage_hash_input = f"{record.get('STAGE_NAME', 'unknown')}*{record.get('STAGE_CATEGORY', '')}*{record.get('STAGE_SUB_CATEGORY', '')}*{window_start_str}*{window_end_str}"
-    STAGE_ID = hashlib.md5(stage_hash_input.encode()).hexdigest()[:16]
+    STAGE_ID = _short_hash(sep.join([
+        str(record.get('STAGE_NAME', 'unknown')).encode(),
+        str(record.get('STAGE_CATEGORY', '')).encode(),
+        str(record.get('STAGE_SUB_CATEGORY', '')).encode(),
+        window_start_bytes,
+        window_end_bytes
+    ]))
     
     # Generate TARGET_ID
-    target_hash_input = f"{record.get('TARGET_NAME', 'unknown')}*{record.get('TARGET_CATEGORY', '')}*{record.get('TARGET_SUB_CATEGORY', '')}*{window_start_str}*{window_end_str}"
-    TARGET_ID = hashlib.md5(target_hash_input.encode()).hexdigest()[:16]
+    TARGET_ID = _short_hash(sep.join([
+        str(record.get('TARGET_NAME', 'unknown')).encode(),
+        str(record.get('TARGET_CATEGORY', '')).encode(),
+        str(record.get('TARGET_SUB_CATEGORY', '')).encode(),
+        window_start_bytes,
+        window_end_bytes
+    ]))
     
     # Generate PIPELINE_ID from the three IDs
-    pipeline_hash_input = f"{SOURCE_ID}*{STAGE_ID}*{TARGET_ID}"
-    PIPELINE_ID = hashlib.md5(pipeline_hash_input.encode()).hexdigest()[:16]
+    PIPELINE_ID = _short_hash(sep.join([SOURCE_ID.encode(), STAGE_ID.encode(), TARGET_ID.encode()]))
     
     # Update record with all IDs
     record['SOURCE_ID'] = SOURCE_ID
@@ -218,23 +249,38 @@ def record_generator(final_config, **context):
                 start_time=start_time_iso
             )
         
-        # Calculate end time
-        end_time_iso = add_duration_to_iso(start_time_iso, granularity_seconds)
+        # Build up to records_per_run consecutive windows, then insert them in one statement
+        records_per_run = final_config.get('records_per_run', 1)
         TARGET_DAY_end_iso = get_end_of_day_iso(TARGET_DAY, timezone)
+        records = []
         
-        # Boundary check
-        if compare_times(end_time_iso, TARGET_DAY_end_iso) > 0:
-            end_time_iso = TARGET_DAY_end_iso
-            log.warning(
-                "End time exceeds target day boundary - capping at midnight",
-                log_key="Record Generator",
-                status="BOUNDARY_CAPPED",
-                original_end_time=add_duration_to_iso(start_time_iso, granularity_seconds),
-                capped_end_time=end_time_iso
-            )
+        while len(records) < records_per_run:
+            # Check if past target day
+            if compare_times(start_time_iso, TARGET_DAY_end_iso) >= 0:
+                break
+            
+            # Calculate end time
+            end_time_iso = add_duration_to_iso(start_time_iso, granularity_seconds)
+            
+            # Boundary check
+            if compare_times(end_time_iso, TARGET_DAY_end_iso) > 0:
+                log.warning(
+                    "End time exceeds target day boundary - capping at midnight",
+                    log_key="Record Generator",
+                    status="BOUNDARY_CAPPED",
+                    original_end_time=end_time_iso,
+                    capped_end_time=TARGET_DAY_end_iso
+                )
+                end_time_iso = TARGET_DAY_end_iso
+            
+            # Create and populate record
+            record = create_base_record(final_config)
+            record = update_time_fields(record, start_time_iso, end_time_iso, TARGET_DAY, final_config, current_time_iso=now_iso)
+            record = generate_pipeline_id(record, final_config)
+            records.append(record)
+            start_time_iso = end_time_iso
         
-        # Check if past target day
-        if compare_times(start_time_iso, TARGET_DAY_end_iso) >= 0:
+        if not records:
             log.info(
                 "Start time is past target day - no record needed",
                 log_key="Record Generator",
@@ -245,23 +291,20 @@ def record_generator(final_config, **context):
             context['task_instance'].xcom_push(key='generated_count', value=0)
             return 0
         
-        # Create and populate record
-        record = create_base_record(final_config)
-        record = update_time_fields(record, start_time_iso, end_time_iso, TARGET_DAY, final_config)
-        record = generate_pipeline_id(record, final_config)
-        insert_drive_record(record, final_config)
+        insert_drive_records(records, final_config)
         
         log.info(
             "Record generation completed successfully",
             log_key="Record Generator",
             status="SUCCESS",
-            PIPELINE_ID=record['PIPELINE_ID'],
-            window_start=start_time_iso,
-            window_end=end_time_iso
+            PIPELINE_ID=records[-1]['PIPELINE_ID'],
+            generated_count=len(records),
+            window_start=records[0]['WINDOW_START_TIME'],
+            window_end=records[-1]['WINDOW_END_TIME']
         )
         
-        context['task_instance'].xcom_push(key='generated_count', value=1)
-        return 1
+        context['task_instance'].xcom_push(key='generated_count', value=len(records))
+        return len(records)
         
     except Exception as e:
         log.exception(
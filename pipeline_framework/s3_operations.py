@@ -1,63 +1,112 @@
 # pipeline_framework/s3_operations.py
-from typing import Dict, Any
+import functools
+import itertools
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Tuple, List, Iterable
 import boto3
-from botocore.exceptions import ClientError, NoCredentialsError
-from pipeline_framework.utils.log_generator import setup_pipeline_logger
+from botocore.config import Config
+from pipeline_framework.utils.lazy_logger import LazyPipelineLogger
+
+log = LazyPipelineLogger("S3Ops")
+
+# Keep-alive keeps the pooled connections warm for the delete workers; explicit timeouts fail fast into retries
+_S3_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    tcp_keepalive=True,
+    connect_timeout=5,
+    read_timeout=60
+)
+
+# Concurrent delete_objects requests per prefix delete
+_S3_DELETE_MAX_WORKERS = 10
+
+_S3_URI_PATTERN = re.compile(r'^s3://([^/]+)/?(.*)$')
+
+
+def _s3_credentials(final_config: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Build the (access_key, secret_key, region) key used to cache S3 clients"""
+    return (
+        final_config['aws_access_key_id'],
+        final_config['aws_secret_access_key'],
+        final_config['aws_region']
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_s3_client(cred_tuple: Tuple[str, str, str]) -> boto3.client:
+    """Create one S3 client per credential set and reuse it for the life of the process"""
+    aws_access_key_id, aws_secret_access_key, region_name = cred_tuple
+    return boto3.client(
+        's3',
+        aws_access_key_id=aws_access_key_id,
+        aws_secret_access_key=aws_secret_access_key,
+        region_name=region_name,
+        config=_S3_CLIENT_CONFIG
+    )
 
-log = setup_pipeline_logger(logger_name="S3Ops")
 
 def s3_connection(final_config: Dict[str, Any]) -> boto3.client:
-    """Create and validate S3 connection"""
-    try:
-        # Create S3 client
-        s3 = boto3.client(
-            's3',
-            aws_access_key_id=final_config['aws_access_key_id'],
-            aws_secret_access_key=final_config['aws_secret_access_key'],
-            region_name=final_config['aws_region']
-        )
-        
-        # Test connection by listing buckets
-        s3.list_buckets()
-        
-        log.info("S3 connection successful")
-        return s3
-        
-    except NoCredentialsError:
-        log.error("S3 credentials not found")
-        raise ConnectionError("S3 credentials not found")
-    except ClientError as e:
-        log.error(f"S3 connection failed: {e}")
-        raise ConnectionError(f"S3 connection failed: {e}")
-    except Exception as e:
-        log.error(f"Unexpected S3 connection error: {e}")
-        raise ConnectionError(f"S3 connection error: {e}")
+    """Get the cached S3 client; credentials are validated lazily on first request"""
+    return _get_s3_client(_s3_credentials(final_config))
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_s3_uri(s3_path: str) -> Tuple[str, str]:
+    """Split 's3://bucket/prefix' into (bucket, prefix)"""
+    match = _S3_URI_PATTERN.match(s3_path)
+    if not match:
+        raise ValueError(f"Invalid S3 path format: {s3_path}")
+    return match.groups()
+
+
+def _get_bucket_prefix(record: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    (bucket, prefix) for the record's STAGE_SUB_CATEGORY.
+    Cached by path string rather than on the record, since every record field is
+    persisted to the drive table; a rewritten path simply misses the cache.
+    The prefix must end with '/' so listings never pick up sibling windows
+    (e.g. '.../10-00' would also match '.../10-00_retry/').
+    """
+    bucket, prefix = _parse_s3_uri(record['STAGE_SUB_CATEGORY'])
+    if not prefix.endswith('/'):
+        raise ValueError(f"S3 stage prefix must end with '/': {record['STAGE_SUB_CATEGORY']}")
+    return bucket, prefix
+
+
+def _list_keys(s3, bucket: str, prefix: str) -> List[str]:
+    """List every object key under a prefix, keeping only the Key of each listed object"""
+    paginator = s3.get_paginator('list_objects_v2')
+    pages = paginator.paginate(Bucket=bucket, Prefix=prefix, PaginationConfig={'PageSize': 1000})
+    # JMESPath projection drops ETag/Size/LastModified/etc. page by page; empty pages yield None
+    return [key for key in pages.search('Contents[].Key') if key is not None]
+
+
+def _count_keys(s3, bucket: str, prefix: str) -> int:
+    """Count object keys under a prefix using each page's KeyCount, without touching per-object entries"""
+    count = 0
+    paginator = s3.get_paginator('list_objects_v2')
+    pages = paginator.paginate(Bucket=bucket, Prefix=prefix, PaginationConfig={'PageSize': 1000})
+    for page in pages:
+        count += page.get('KeyCount', 0)
+    return count
+
+
+def _prefix_has_objects(s3, bucket: str, prefix: str) -> bool:
+    """Single-request LIST probe for at least one object under prefix"""
+    response = s3.list_objects_v2(Bucket=bucket, Prefix=prefix, MaxKeys=1)
+    return response.get('KeyCount', 0) > 0
+
 
 def s3_count(final_config: Dict[str, Any], record: Dict[str, Any]) -> int:
     """Count objects in S3 for given pipeline"""
+    bucket, prefix = _get_bucket_prefix(record)
     try:
-        s3 = s3_connection(final_config)
+        s3 = _get_s3_client(_s3_credentials(final_config))
         
-        # Get S3 path from record
-        s3_path = record['STAGE_SUB_CATEGORY']
-        if not s3_path.startswith('s3://'):
-            raise ValueError(f"Invalid S3 path format: {s3_path}")
-        
-        # Extract bucket and prefix
-        path_parts = s3_path[5:].split('/', 1)  # Remove 's3://'
-        bucket = path_parts[0]
-        prefix = path_parts[1] if len(path_parts) > 1 else ""
-        
-        paginator = s3.get_paginator('list_objects_v2')
-        page_iterator = paginator.paginate(
-            Bucket=bucket,
-            Prefix=prefix
-        )
-        
-        count = 0
-        for page in page_iterator:
-            if 'Contents' in page:
-                count += len(page['Contents'])  # Counting NUMBER OF FILES
+        # Counting NUMBER OF FILES
+        count = _count_keys(s3, bucket, prefix)
         
         log.info(f"S3 file count: {count}", PIPELINE_ID=record['PIPELINE_ID'])
         return count
@@ -68,27 +117,12 @@ def s3_count(final_config: Dict[str, Any], record: Dict[str, Any]) -> int:
 
 def s3_check_exists(final_config: Dict[str, Any], record: Dict[str, Any]) -> bool:
     """Check if objects exist in S3 using STAGE_SUB_CATEGORY from record"""
+    bucket, prefix = _get_bucket_prefix(record)
     try:
-        s3 = s3_connection(final_config)
-        
-        # Get S3 path from record
-        s3_path = record['STAGE_SUB_CATEGORY']
-        if not s3_path.startswith('s3://'):
-            raise ValueError(f"Invalid S3 path format: {s3_path}")
-        
-        # Extract bucket and prefix
-        path_parts = s3_path[5:].split('/', 1)  # Remove 's3://'
-        bucket = path_parts[0]
-        prefix = path_parts[1] if len(path_parts) > 1 else ""
+        s3 = _get_s3_client(_s3_credentials(final_config))
         
         # Check if any objects exist with this prefix
-        response = s3.list_objects_v2(
-            Bucket=bucket,
-            Prefix=prefix,
-            MaxKeys=1
-        )
-        
-        exists = 'Contents' in response and len(response['Contents']) > 0
+        exists = _prefix_has_objects(s3, bucket, prefix)
         log.info(f"S3 exists check: {exists}", PIPELINE_ID=record['PIPELINE_ID'])
         return exists
         
@@ -96,37 +130,43 @@ def s3_check_exists(final_config: Dict[str, Any], record: Dict[str, Any]) -> boo
         log.exception("S3 exists check failed", PIPELINE_ID=record['PIPELINE_ID'])
         raise
 
+def _delete_keys(s3, bucket: str, keys: Iterable[str]) -> int:
+    """Delete keys in parallel 1000-key batches; returns the number deleted, raises if any key failed"""
+    keys = iter(keys)
+    delete_count = 0
+    errors = []
+    with ThreadPoolExecutor(max_workers=_S3_DELETE_MAX_WORKERS) as executor:
+        futures = {}
+        while True:
+            # delete_objects accepts at most 1000 keys per request
+            objects = [{'Key': key} for key in itertools.islice(keys, 1000)]
+            if not objects:
+                break
+            # Quiet mode only reports failed keys in the response
+            future = executor.submit(
+                s3.delete_objects,
+                Bucket=bucket,
+                Delete={'Objects': objects, 'Quiet': True}
+            )
+            futures[future] = len(objects)
+        
+        for future in as_completed(futures):
+            batch_errors = future.result().get('Errors', [])
+            errors.extend(batch_errors)
+            delete_count += futures[future] - len(batch_errors)
+    
+    if errors:
+        raise RuntimeError(f"S3 delete failed for {len(errors)} objects: {errors[:5]}")
+    return delete_count
+
+
 def s3_delete(final_config: Dict[str, Any], record: Dict[str, Any]) -> bool:
     """Delete objects from S3 using STAGE_SUB_CATEGORY from record"""
+    bucket, prefix = _get_bucket_prefix(record)
     try:
-        s3 = s3_connection(final_config)
-        
-        # Get S3 path from record
-        s3_path = record['STAGE_SUB_CATEGORY']
-        if not s3_path.startswith('s3://'):
-            raise ValueError(f"Invalid S3 path format: {s3_path}")
+        s3 = _get_s3_client(_s3_credentials(final_config))
         
-        # Extract bucket and prefix
-        path_parts = s3_path[5:].split('/', 1)  # Remove 's3://'
-        bucket = path_parts[0]
-        prefix = path_parts[1] if len(path_parts) > 1 else ""
-        
-        paginator = s3.get_paginator('list_objects_v2')
-        page_iterator = paginator.paginate(
-            Bucket=bucket,
-            Prefix=prefix
-        )
-        
-        delete_count = 0
-        for page in page_iterator:
-            if 'Contents' in page:
-                objects = [{'Key': obj['Key']} for obj in page['Contents']]
-                if objects:
-                    s3.delete_objects(
-                        Bucket=bucket,
-                        Delete={'Objects': objects}
-                    )
-                    delete_count += len(objects)
+        delete_count = _delete_keys(s3, bucket, _list_keys(s3, bucket, prefix))
         
         log.info(f"S3 delete: {delete_count} objects", PIPELINE_ID=record['PIPELINE_ID'])
         return True
@@ -134,5 +174,3 @@ def s3_delete(final_config: Dict[str, Any], record: Dict[str, Any]) -> bool:
     except Exception as e:
         log.exception("S3 delete failed", PIPELINE_ID=record['PIPELINE_ID'])
         raise
-
-
@@ -1,47 +1,67 @@
 # pipeline_framework/s3_to_snowflake.py
 
-import time
-from typing import Dict, Any
-from pipeline_framework.utils.snowflake_utils import SnowflakeQueryClient
-from pipeline_framework.utils.log_generator import setup_pipeline_logger
+import asyncio
+from typing import Dict, Any, List
+from pipeline_framework.source import count as source_count
+from pipeline_framework.snowflake_operations import snowflake_connection, snowflake_count
+from pipeline_framework.utils.lazy_logger import LazyPipelineLogger
 from pipeline_framework.utils.log_retry_decorators import retry, log_execution_time
 
-log = setup_pipeline_logger(logger_name="S3ToSnowflake")
+log = LazyPipelineLogger("S3ToSnowflake")
 
 @retry(max_attempts=3, delay_seconds=30)
 def execute_snowflake_task(final_config: Dict[str, Any], record: Dict[str, Any]) -> bool:
     """Execute Snowflake task that wraps snowpipe"""
-    snowflake_creds = {
-        'account': final_config['snowflake_account'],
-        'user': final_config['snowflake_user'],
-        'password': final_config['snowflake_password'],
-        'role': final_config['snowflake_role'],
-        'warehouse': final_config['snowflake_warehouse']
-    }
-    
-    snowflake_config = {
-        'database': final_config['target_database'],
-        'schema': final_config['target_schema'],
-        'table': final_config['target_table']
-    }
-    
     task_name = final_config['snowflake_task_name']
     execute_query = f"EXECUTE TASK {task_name}"
     
-    with SnowflakeQueryClient(snowflake_creds, snowflake_config) as client:
+    # The connection is pooled with snowflake_operations' and stays open for the next step
+    with snowflake_connection(final_config) as client:
         result = client.execute_control_command(execute_query)
+    
+    log.info(
+        f"Snowflake task executed: {task_name}",
+        PIPELINE_ID=record['PIPELINE_ID'],
+        query_id=result['query_id']
+    )
+    
+    return True
+
+async def wait_for_snowpipe_load(final_config: Dict[str, Any], record: Dict[str, Any]) -> bool:
+    """Poll the target count with exponential backoff until it reaches the source count"""
+    max_wait_seconds = final_config.get('snowpipe_max_wait_seconds', 600)
+    expected_count = await asyncio.to_thread(source_count, final_config, record)
+    
+    waited_seconds = 0
+    attempt = 0
+    while True:
+        loaded_count = await asyncio.to_thread(snowflake_count, final_config, record)
+        if loaded_count >= expected_count:
+            log.info(
+                f"Snowpipe load complete after {waited_seconds:.0f}s",
+                PIPELINE_ID=record['PIPELINE_ID'],
+                expected_count=expected_count,
+                loaded_count=loaded_count
+            )
+            return True
         
-        log.info(
-            f"Snowflake task executed: {task_name}",
-            PIPELINE_ID=record['PIPELINE_ID'],
-            query_id=result['query_id']
-        )
+        if waited_seconds >= max_wait_seconds:
+            log.warning(
+                f"Snowpipe load incomplete after {max_wait_seconds}s",
+                PIPELINE_ID=record['PIPELINE_ID'],
+                expected_count=expected_count,
+                loaded_count=loaded_count
+            )
+            return False
         
-        return True
+        # Yields the event loop so other records' waits can progress meanwhile
+        delay = min(5 * 1.5 ** attempt, max_wait_seconds - waited_seconds)
+        await asyncio.sleep(delay)
+        waited_seconds += delay
+        attempt += 1
 
-@log_execution_time
-def transfer_s3_to_snowflake(final_config: Dict[str, Any], record: Dict[str, Any]) -> bool:
-    """Main transfer function with 2-minute wait"""
+async def transfer_s3_to_snowflake_async(final_config: Dict[str, Any], record: Dict[str, Any]) -> bool:
+    """Async transfer; blocking Snowflake calls run in worker threads while the snowpipe wait is awaited"""
     try:
         log.info(
             "Starting Snowflake task execution",
@@ -49,20 +69,20 @@ def transfer_s3_to_snowflake(final_config: Dict[str, Any], record: Dict[str, Any
             task_name=final_config['snowflake_task_name']
         )
         
-        success = execute_snowflake_task(final_config, record)
+        success = await asyncio.to_thread(execute_snowflake_task, final_config, record)
         
         if success:
             log.info(
-                "Snowflake task triggered - waiting 2 minutes for snowpipe completion",
+                "Snowflake task triggered - polling for snowpipe completion",
                 PIPELINE_ID=record['PIPELINE_ID']
             )
             
-            time.sleep(120)  # 2 minutes
-            
-            log.info(
-                "Snowpipe wait completed - transfer assumed successful",
-                PIPELINE_ID=record['PIPELINE_ID']
-            )
+            if not await wait_for_snowpipe_load(final_config, record):
+                # The audit step performs the authoritative count check
+                log.info(
+                    "Snowpipe wait ended before counts matched - deferring to audit",
+                    PIPELINE_ID=record['PIPELINE_ID']
+                )
         
         return success
         
@@ -73,5 +93,14 @@ def transfer_s3_to_snowflake(final_config: Dict[str, Any], record: Dict[str, Any
         )
         raise
 
+async def transfer_records_s3_to_snowflake_async(final_config: Dict[str, Any], records: List[Dict[str, Any]]) -> List[Any]:
+    """Run the transfers for many records concurrently on one event loop; failures are returned, not raised"""
+    return await asyncio.gather(
+        *(transfer_s3_to_snowflake_async(final_config, record) for record in records),
+        return_exceptions=True
+    )
 
-
+@log_execution_time
+def transfer_s3_to_snowflake(final_config: Dict[str, Any], record: Dict[str, Any]) -> bool:
+    """Main transfer function; sync wrapper around transfer_s3_to_snowflake_async"""
+    return asyncio.run(transfer_s3_to_snowflake_async(final_config, record))
@@ -1,37 +1,57 @@
 # pipeline_framework/snowflake_operations.py
-from typing import Dict, Any
+import re
+from typing import Dict, Any, Tuple, Optional
 from pipeline_framework.utils.snowflake_utils import SnowflakeQueryClient
-from pipeline_framework.utils.log_generator import setup_pipeline_logger
+from pipeline_framework.utils.lazy_logger import LazyPipelineLogger
 
-log = setup_pipeline_logger(logger_name="SnowflakeOps")
+log = LazyPipelineLogger("SnowflakeOps")
+
+_IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_$]*$')
+
+
+def _snowflake_identity(final_config: Dict[str, Any]) -> Tuple[str, ...]:
+    """Frozen (account, user, role, warehouse, database, schema, table) identity of the target"""
+    return (
+        final_config['snowflake_account'],
+        final_config['snowflake_user'],
+        final_config['snowflake_role'],
+        final_config['snowflake_warehouse'],
+        final_config['target_database'],
+        final_config['target_schema'],
+        final_config['target_table']
+    )
+
+def _get_snowflake_client(final_config: Dict[str, Any]) -> SnowflakeQueryClient:
+    """Build a client for the target; its connection comes from the process-wide pool in snowflake_utils"""
+    account, user, role, warehouse, database, schema, table = _snowflake_identity(final_config)
+    snowflake_creds = {
+        'account': account,
+        'user': user,
+        'password': final_config['snowflake_password'],
+        'role': role,
+        'warehouse': warehouse
+    }
+    
+    snowflake_config = {
+        'database': database,
+        'schema': schema,
+        'table': table
+    }
+    
+    return SnowflakeQueryClient(snowflake_creds, snowflake_config)
+
+def _target_table_name(final_config: Dict[str, Any]) -> str:
+    """Build the fully qualified target table name, rejecting anything that is not a plain identifier"""
+    parts = _snowflake_identity(final_config)[4:]
+    for part in parts:
+        if not _IDENTIFIER_PATTERN.match(part):
+            raise ValueError(f"Invalid Snowflake identifier: {part!r}")
+    return '.'.join(parts)
 
 def snowflake_connection(final_config: Dict[str, Any]) -> SnowflakeQueryClient:
-    """Create and validate Snowflake connection"""
+    """Get a Snowflake client; its pooled connection is opened lazily on the first query"""
     try:
-        snowflake_creds = {
-            'account': final_config['snowflake_account'],
-            'user': final_config['snowflake_user'],
-            'password': final_config['snowflake_password'],
-            'role': final_config['snowflake_role'],
-            'warehouse': final_config['snowflake_warehouse']
-        }
-        
-        snowflake_config = {
-            'database': final_config['target_database'],
-            'schema': final_config['target_schema'],
-            'table': final_config['target_table']
-        }
-        
-        # Create client and test connection
-        client = SnowflakeQueryClient(snowflake_creds, snowflake_config)
-        
-        # Test connection with simple query
-        test_result = client.execute_scalar_query("SELECT 1 as test")
-        if test_result['data'] != 1:
-            raise ConnectionError("Snowflake connection test failed")
-        
-        log.info("Snowflake connection successful")
-        return client
+        return _get_snowflake_client(final_config)
         
     except Exception as e:
         log.error(f"Snowflake connection failed: {e}")
@@ -40,15 +60,15 @@ def snowflake_connection(final_config: Dict[str, Any]) -> SnowflakeQueryClient:
 def snowflake_count(final_config: Dict[str, Any], record: Dict[str, Any]) -> int:
     """Count records in Snowflake target table"""
     try:
-        with snowflake_connection(final_config) as client:
-            query = f"""
-            SELECT COUNT(*) as count
-            FROM {final_config['target_database']}.{final_config['target_schema']}.{final_config['target_table']}
-            WHERE FILENAME LIKE  '{record["TARGET_SUB_CATEGORY"]}'
-            """
-            
-            result = client.execute_scalar_query(query, {})
-            count = result['data'] or 0
+        query = f"""
+        SELECT COUNT(*) as count
+        FROM {_target_table_name(final_config)}
+        WHERE FILENAME LIKE %(filename_pattern)s
+        """
+        
+        with _get_snowflake_client(final_config) as client:
+            result = client.execute_scalar_query(query, {'filename_pattern': record['TARGET_SUB_CATEGORY']})
+        count = result['data'] or 0
             
         log.info(f"Snowflake count: {count}", PIPELINE_ID=record['PIPELINE_ID'])
         return count
@@ -60,22 +80,40 @@ def snowflake_count(final_config: Dict[str, Any], record: Dict[str, Any]) -> int
 def snowflake_check_exists(final_config: Dict[str, Any], record: Dict[str, Any]) -> bool:
     """Check if data exists in Snowflake target table"""
     try:
-        count = snowflake_count(final_config, record)
-        return count > 0
+        # Existence probe: Snowflake can stop at the first matching row instead of counting them all
+        query = f"""
+        SELECT 1
+        FROM {_target_table_name(final_config)}
+        WHERE FILENAME LIKE %(filename_pattern)s
+        LIMIT 1
+        """
+        
+        with _get_snowflake_client(final_config) as client:
+            result = client.execute_scalar_query(query, {'filename_pattern': record['TARGET_SUB_CATEGORY']})
+        exists = result['data'] is not None
+        
+        log.info(f"Snowflake exists check: {exists}", PIPELINE_ID=record['PIPELINE_ID'])
+        return exists
     except Exception as e:
         log.exception("Snowflake exists check failed", PIPELINE_ID=record['PIPELINE_ID'])
         raise
 
-def snowflake_delete(final_config: Dict[str, Any], record: Dict[str, Any]) -> bool:
-    """Delete records from Snowflake target table"""
+def snowflake_delete(final_config: Dict[str, Any], record: Dict[str, Any], known_exists: Optional[bool] = None) -> bool:
+    """Delete records from Snowflake target table; known_exists skips the existence probe when the caller already ran it"""
     try:
-        with snowflake_connection(final_config) as client:
-            query = f"""
-            DELETE FROM {final_config['target_database']}.{final_config['target_schema']}.{final_config['target_table']}
-            WHERE FILENAME LIKE  '{record["TARGET_SUB_CATEGORY"]}'
-            """
-            
-            result = client.execute_dml_query(query, {})
+        # Skip the warehouse-touching DELETE when the window is already clean (idempotent re-runs)
+        exists = snowflake_check_exists(final_config, record) if known_exists is None else known_exists
+        if not exists:
+            log.info("Snowflake delete: nothing to delete", PIPELINE_ID=record['PIPELINE_ID'])
+            return True
+        
+        query = f"""
+        DELETE FROM {_target_table_name(final_config)}
+        WHERE FILENAME LIKE %(filename_pattern)s
+        """
+        
+        with _get_snowflake_client(final_config) as client:
+            result = client.execute_dml_query(query, {'filename_pattern': record['TARGET_SUB_CATEGORY']})
             
         log.info(f"Snowflake delete: {result['rows_affected']} rows", PIPELINE_ID=record['PIPELINE_ID'])
         return True
@@ -6,11 +6,11 @@ Teams replace the import line with their specific source implementation.
 """
 
 
-from pipeline_framework.elasticsearch_operations import elasticsearch_count, elasticsearch_check_exists, elasticsearch_delete
+from pipeline_framework.elasticsearch_operations import elasticsearch_count, elasticsearch_check_exists
 
-from pipeline_framework.utils.log_generator import setup_pipeline_logger
+from pipeline_framework.utils.lazy_logger import LazyPipelineLogger
 
-log = setup_pipeline_logger(logger_name="Source")
+log = LazyPipelineLogger("Source")
 
 
 def count(final_config, record):
@@ -5,40 +5,45 @@ Source to Stage transfer interface.
 Teams replace the import line with their specific transfer implementation.
 """
 
-from pipeline_framework.utils.time_utils import get_current_time_iso
 from pipeline_framework.stage import delete as delete_stage
+from pipeline_framework.stage import check_exists as check_stage_exists
 from pipeline_framework.utils.time_utility import get_current_time_iso
-from pipeline_framework.drive_record_adapter import update_record_in_drive_table
+from pipeline_framework.drive_record_adapter import finalize_record
 from pipeline_framework.elasticsearch_to_s3 import transfer_elasticsearch_to_s3
-from pipeline_framework.utils.log_generator import setup_pipeline_logger
+from pipeline_framework.utils.lazy_logger import LazyPipelineLogger
 
-log = setup_pipeline_logger(logger_name="SourceToStage")
+log = LazyPipelineLogger("SourceToStage")
+
+# Drive-table record keys owned by this phase (UPPERCASE, matching the drive table template)
+STATUS_KEY = 'SOURCE_TO_STAGE_INGESTION_STATUS'
+START_TIME_KEY = 'SOURCE_TO_STAGE_INGESTION_START_TIME'
+END_TIME_KEY = 'SOURCE_TO_STAGE_INGESTION_END_TIME'
 
 def transfer(final_config, record):
     """Transfer data from source to stage with cleanup, idempotency, and minimal writes."""
+    tz = final_config['timezone']
     try:
         #  1. Skip if already completed
-        if record.get('SOURCE_TO_STAGE_INGESTION_STATUS') == 'COMPLETED':
+        if record.get(STATUS_KEY) == 'COMPLETED':
             log.info("Source to Stage already marked COMPLETED. Skipping.", PIPELINE_ID=record['PIPELINE_ID'])
             return True
-        record['SOURCE_TO_STAGE_INGESTION_START_TIME'] = get_current_time_iso(final_config['timezone'])
+        record[START_TIME_KEY] = get_current_time_iso(tz)
 
-        #  2. Clean existing stage files before transfer
-        delete_stage(final_config, record)
+        #  2. Clean existing stage files before transfer (skipped when the stage is already empty)
+        if not final_config.get('skip_precleanup_when_empty', True) or check_stage_exists(final_config, record):
+            delete_stage(final_config, record)
 
         #  3. Execute transfer (no intermediate status writes)
         result = transfer_elasticsearch_to_s3(final_config, record)
 
         if result:
-            #  4. On success, mark completed
-            record.update({
-                'SOURCE_TO_STAGE_INGESTION_STATUS': 'COMPLETED',
+            #  4. On success, mark completed (one timestamp for every end/updated field)
+            now = get_current_time_iso(tz)
+            finalize_record(record, final_config, {
+                STATUS_KEY: 'COMPLETED',
                 'COMPLETED_PHASE': 'SOURCE_TO_STAGE',
-                'SOURCE_TO_STAGE_INGESTION_END_TIME': get_current_time_iso(final_config['timezone']),
-                'RECORD_LAST_UPDATED_TIME': get_current_time_iso(final_config['timezone'])
-            })
-            # Update record in drive table
-            update_record_in_drive_table(record, final_config)
+                END_TIME_KEY: now
+            }, current_time_iso=now)
 
             log.info("Source to Stage transfer completed successfully.", PIPELINE_ID=record['PIPELINE_ID'])
             return True
@@ -55,17 +60,15 @@ def transfer(final_config, record):
             log.warning("Stage cleanup after failure also failed", PIPELINE_ID=record['PIPELINE_ID'])
 
         #  6. Reset record for retry
-        record.update({
-            'SOURCE_TO_STAGE_INGESTION_STATUS': 'PENDING',
-            'SOURCE_TO_STAGE_INGESTION_END_TIME': None,
-            'SOURCE_TO_STAGE_INGESTION_START_TIME': None,
+        finalize_record(record, final_config, {
+            STATUS_KEY: 'PENDING',
+            END_TIME_KEY: None,
+            START_TIME_KEY: None,
             'PIPELINE_START_TIME': None,
             'PIPELINE_STATUS': 'PENDING',
             'DAG_RUN_ID': None,
-            'RETRY_ATTEMPT': record.get('RETRY_ATTEMPT', 0) + 1,
-            'RECORD_LAST_UPDATED_TIME': get_current_time_iso(final_config['timezone'])
+            'RETRY_ATTEMPT': record.get('RETRY_ATTEMPT', 0) + 1
         })
-        update_record_in_drive_table(record, final_config)
 
 
         raise
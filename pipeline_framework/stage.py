@@ -8,9 +8,9 @@ Teams replace the import line with their specific stage implementation.
 # TEAM CUSTOMIZATION: Replace this import with your stage operations
 from pipeline_framework.s3_operations import s3_count, s3_check_exists, s3_delete
 
-from pipeline_framework.utils.log_generator import setup_pipeline_logger
+from pipeline_framework.utils.lazy_logger import LazyPipelineLogger
 
-log = setup_pipeline_logger(logger_name="Stage")
+log = LazyPipelineLogger("Stage")
 
 
 def count(final_config, record):
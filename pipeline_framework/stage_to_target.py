@@ -6,37 +6,44 @@ Teams replace the import line with their specific transfer implementation.
 """
 from pipeline_framework.s3_to_snowflake import transfer_s3_to_snowflake
 from pipeline_framework.target import delete as delete_target
+from pipeline_framework.target import check_exists as check_target_exists
 from pipeline_framework.utils.time_utility import get_current_time_iso
-from pipeline_framework.utils.log_generator import setup_pipeline_logger
-from pipeline_framework.drive_record_adapter import update_record_in_drive_table
+from pipeline_framework.utils.lazy_logger import LazyPipelineLogger
+from pipeline_framework.drive_record_adapter import finalize_record
 
-log = setup_pipeline_logger(logger_name="StageToTarget")
+log = LazyPipelineLogger("StageToTarget")
+
+# Drive-table record keys owned by this phase (UPPERCASE, matching the drive table template)
+STATUS_KEY = 'STAGE_TO_TARGET_INGESTION_STATUS'
+START_TIME_KEY = 'STAGE_TO_TARGET_INGESTION_START_TIME'
+END_TIME_KEY = 'STAGE_TO_TARGET_INGESTION_END_TIME'
 
 def transfer(final_config, record):
     """Transfer data from stage to target with pre-cleanup, retry support, and consistent status tracking."""
+    tz = final_config['timezone']
     try:
         #  1. Skip if already completed
-        if record.get('STAGE_TO_TARGET_INGESTION_STATUS') == 'COMPLETED':
+        if record.get(STATUS_KEY) == 'COMPLETED':
             log.info("Stage to Target already marked COMPLETED. Skipping.", PIPELINE_ID=record['PIPELINE_ID'])
             return True
-        record['STAGE_TO_TARGET_INGESTION_START_TIME'] = get_current_time_iso(final_config['timezone'])
+        record[START_TIME_KEY] = get_current_time_iso(tz)
 
-        #  2. Clean up target before starting new transfer
-        delete_target(final_config, record)
+        #  2. Clean up target before starting new transfer (skipped when the target is already empty)
+        if not final_config.get('skip_precleanup_when_empty', True) or check_target_exists(final_config, record):
+            delete_target(final_config, record, known_exists=True)
 
         #  3. Run the transfer (no IN_PROGRESS update)
         result = transfer_s3_to_snowflake(final_config, record)
 
         if result:
 
-            #  4. On success, mark completed
-            record.update({
-                'STAGE_TO_TARGET_INGESTION_STATUS': 'COMPLETED',
+            #  4. On success, mark completed (one timestamp for every end/updated field)
+            now = get_current_time_iso(tz)
+            finalize_record(record, final_config, {
+                STATUS_KEY: 'COMPLETED',
                 'COMPLETED_PHASE': 'STAGE_TO_TARGET',
-                'RECORD_LAST_UPDATED_TIME': get_current_time_iso(final_config['timezone'])
-            })
-
-            update_record_in_drive_table(record, final_config)
+                END_TIME_KEY: now
+            }, current_time_iso=now)
 
 
 
@@ -57,19 +64,16 @@ def transfer(final_config, record):
             log.warning("Target cleanup after failure also failed", PIPELINE_ID=record['PIPELINE_ID'])
 
         #  6. Reset for retry
-        record.update({
-            'STAGE_TO_TARGET_INGESTION_STATUS': 'PENDING',
-            'STAGE_TO_TARGET_INGESTION_START_TIME': None,
-            'STAGE_TO_TARGET_INGESTION_END_TIME': None,
+        finalize_record(record, final_config, {
+            STATUS_KEY: 'PENDING',
+            START_TIME_KEY: None,
+            END_TIME_KEY: None,
             'PIPELINE_START_TIME': None,
             'PIPELINE_STATUS': 'PENDING',
             'DAG_RUN_ID': None,
-            'RETRY_ATTEMPT': record.get('RETRY_ATTEMPT', 0) + 1,
-            'RECORD_LAST_UPDATED_TIME': get_current_time_iso(final_config['timezone'])
+            'RETRY_ATTEMPT': record.get('RETRY_ATTEMPT', 0) + 1
         })
 
-        update_record_in_drive_table(record, final_config)
-
         raise
 
 
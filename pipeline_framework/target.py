@@ -8,9 +8,9 @@ Teams replace the import line with their specific target implementation.
 # TEAM CUSTOMIZATION: Replace this import with your target operations
 from pipeline_framework.snowflake_operations import snowflake_count, snowflake_check_exists, snowflake_delete
 
-from pipeline_framework.utils.log_generator import setup_pipeline_logger
+from pipeline_framework.utils.lazy_logger import LazyPipelineLogger
 
-log = setup_pipeline_logger(logger_name="Target")
+log = LazyPipelineLogger("Target")
 
 
 def count(final_config, record):
@@ -23,6 +23,6 @@ def check_exists(final_config, record):
     return snowflake_check_exists(final_config, record)
 
 
-def delete(final_config, record):
-    """Delete data from target system for the given time window."""
-    return snowflake_delete(final_config, record)
\ No newline at end of file
+def delete(final_config, record, known_exists=None):
+    """Delete data from target system for the given time window (known_exists: result of a check_exists the caller already ran)."""
+    return snowflake_delete(final_config, record, known_exists=known_exists)
\ No newline at end of file
@@ -1,67 +1,69 @@
 # pipeline_framework/task_handlers.py
 
+from typing import Dict, Any
 from airflow.exceptions import AirflowSkipException
+from pipeline_framework.configs_handler_func import get_cached_final_config
 from pipeline_framework import source_to_stage, stage_to_target, audit
 from pipeline_framework.record_generator import record_generator, validate_record  
-from pipeline_framework.drive_record_adapter import update_record_fields
+from pipeline_framework.drive_record_adapter import lock_record_for_processing, cleanup_stale_locks, get_oldest_pending_record, fetch_record
 from pipeline_framework.utils.time_utility import get_current_time_iso
-from pipeline_framework.utils.log_generator import setup_pipeline_logger
-from pipeline_framework.drive_record_adapter import cleanup_stale_locks
-from pipeline_framework.drive_record_adapter import get_oldest_pending_record
-from pipeline_framework.utils.time_utils import get_current_time_iso
+from pipeline_framework.utils.lazy_logger import LazyPipelineLogger
 
-log = setup_pipeline_logger(logger_name="TaskHandlers")
+log = LazyPipelineLogger("TaskHandlers")
 
-def record_generator_task(**context):
+def resolve_final_config(config_ref: Dict[str, str]) -> Dict[str, Any]:
+    """Load the merged config from the {'root', 'index', 'drive'} path reference passed via op_kwargs"""
+    return get_cached_final_config(config_ref['root'], config_ref['index'], config_ref['drive'])
+
+def record_generator_task(config_ref: Dict[str, str], **context):
     """Generate one record per DAG run"""
-    final_config = context['params']['final_config']
+    final_config = resolve_final_config(config_ref)
     count = record_generator(final_config, **context)
     return count
 
-def validate_record_task(**context):
+def validate_record_task(config_ref: Dict[str, str], **context):
     """Validate generated record for future data and processing status"""
-    final_config = context['params']['final_config']
+    final_config = resolve_final_config(config_ref)
     record = validate_record(final_config, **context)
     return record
 
-def source_to_stage_task(**context):
+def source_to_stage_task(config_ref: Dict[str, str], **context):
     """Lock record and execute source to stage transfer"""
-    final_config = context['params']['final_config']
-    record = context['task_instance'].xcom_pull(task_ids='validate_record_task')
+    final_config = resolve_final_config(config_ref)
+    PIPELINE_ID = context['task_instance'].xcom_pull(task_ids='pick_pending_record_task')
     DAG_RUN_ID = context['dag_run'].dag_id + "_" + context['dag_run'].run_id
     
-    # Lock record (Airflow-specific)
-    update_record_fields(record['PIPELINE_ID'], {
-        'DAG_RUN_ID': DAG_RUN_ID,
-        'PIPELINE_START_TIME': get_current_time_iso(final_config['timezone']),
-        'PIPELINE_STATUS': 'IN_PROGRESS'
-    }, final_config)
+    # Lock record (Airflow-specific); only proceeds if the record was still PENDING
+    PIPELINE_START_TIME = get_current_time_iso(final_config['timezone'])
+    if not lock_record_for_processing(PIPELINE_ID, DAG_RUN_ID, final_config, PIPELINE_START_TIME):
+        raise AirflowSkipException("lost race")
+    record = fetch_record(PIPELINE_ID, final_config)
     
-    # Execute transfer
-    result = source_to_stage.transfer(final_config, record)
-    context['task_instance'].xcom_push(key='record', value=record)
-    return result
+    # Execute transfer; only the PIPELINE_ID is handed to the next task, which re-reads the record
+    source_to_stage.transfer(final_config, record)
+    return PIPELINE_ID
 
-def stage_to_target_task(**context):
+def stage_to_target_task(config_ref: Dict[str, str], **context):
     """Execute stage to target transfer"""
-    final_config = context['params']['final_config']
-    record = context['task_instance'].xcom_pull(task_ids='source_to_stage_task', key='record')
+    final_config = resolve_final_config(config_ref)
+    PIPELINE_ID = context['task_instance'].xcom_pull(task_ids='source_to_stage_task')
+    record = fetch_record(PIPELINE_ID, final_config)
     
-    result = stage_to_target.transfer(final_config, record)
-    context['task_instance'].xcom_push(key='record', value=record)
-    return result
+    stage_to_target.transfer(final_config, record)
+    return PIPELINE_ID
 
-def audit_task(**context):
+def audit_task(config_ref: Dict[str, str], **context):
     """Execute audit validation"""
-    final_config = context['params']['final_config']
-    record = context['task_instance'].xcom_pull(task_ids='stage_to_target_task', key='record')
+    final_config = resolve_final_config(config_ref)
+    PIPELINE_ID = context['task_instance'].xcom_pull(task_ids='stage_to_target_task')
+    record = fetch_record(PIPELINE_ID, final_config)
     
     result = audit.audit(final_config, record)
     return result
 
-def cleanup_stale_locks_task(**context):
+def cleanup_stale_locks_task(config_ref: Dict[str, str], **context):
     """Cleanup stale locks implementation"""
-    final_config = context['params']['final_config']
+    final_config = resolve_final_config(config_ref)
     
     stale_hours = final_config.get('stale_lock_hours', 2)
     count = cleanup_stale_locks(final_config, stale_hours)
@@ -71,38 +73,24 @@ def cleanup_stale_locks_task(**context):
 
 
 
-def pick_pending_record_task(**context):
-    """Pick the oldest valid PENDING record. Skip if none or if record is for the future."""
-    from pipeline_framework.drive_record_adapter import get_oldest_pending_record
-    from airflow.exceptions import AirflowSkipException
-    from pipeline_framework.utils.time_utility import get_current_time_iso, compare_times
-
-    final_config = context['params']['final_config']
+def pick_pending_record_task(config_ref: Dict[str, str], **context):
+    """
+    Pick the oldest valid PENDING record and return its PIPELINE_ID.
+    Returns None if there is none (or only future windows), which short-circuits the downstream tasks.
+    """
+    final_config = resolve_final_config(config_ref)
     priority = final_config.get("pipeline_priority", "xyz")
 
-    # Step 1: Find oldest pending record
+    # Oldest pending record whose window has already started (future windows are filtered in SQL)
     record = get_oldest_pending_record(final_config, priority)
 
     if not record:
-        log.info(" No pending record found", log_key="PickPendingRecord", status="SKIPPED")
-        raise AirflowSkipException("No pending record found")
-
-    # Step 2: Check if record is from the future
-    current_time_iso = get_current_time_iso(final_config["timezone"])
-    if compare_times(record['window_start_time'], current_time_iso) > 0:
-        log.info(
-            "⏳ Record window_start_time is in the future — skipping",
-            log_key="PickPendingRecord",
-            status="FUTURE_SKIPPED",
-            record_start=record['window_start_time'],
-            current=current_time_iso
-        )
-        raise AirflowSkipException("Record is not yet eligible (future window_start_time)")
+        log.info(" No eligible pending record found", log_key="PickPendingRecord", status="SKIPPED")
+        return None
 
     # ✅ Valid record — proceed
     log.info("✅ Valid pending record selected", log_key="PickPendingRecord", status="SELECTED", PIPELINE_ID=record['PIPELINE_ID'])
-    context['task_instance'].xcom_push(key='validated_record', value=record)
-    return record
+    return record['PIPELINE_ID']
 
 
 
@@ -0,0 +1,29 @@
+# pipeline_framework/utils/lazy_logger.py
+
+"""
+Lazy access to pipeline loggers.
+Modules bind a LazyPipelineLogger at import time; the underlying logger is
+only set up on first use and shared per logger name.
+"""
+
+import functools
+from typing import Any
+
+
+@functools.lru_cache(maxsize=None)
+def get_pipeline_logger(logger_name: str) -> Any:
+    """Set up (once per name) and return the pipeline logger"""
+    from pipeline_framework.utils.log_generator import setup_pipeline_logger
+    return setup_pipeline_logger(logger_name=logger_name)
+
+
+class LazyPipelineLogger:
+    """Module-level logger proxy that defers setup_pipeline_logger until first call"""
+
+    __slots__ = ('_logger_name',)
+
+    def __init__(self, logger_name: str):
+        self._logger_name = logger_name
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(get_pipeline_logger(self._logger_name), attr)
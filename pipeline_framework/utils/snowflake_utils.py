@@ -1,10 +1,43 @@
 # pipeline_logic_scripts/utils/snowflake_utils.py
 
-from typing import Optional, Any, Dict, Tuple
-import pandas as pd
-from pandas import DataFrame
-import snowflake.connector
-from snowflake.connector.pandas_tools import write_pandas
+from __future__ import annotations
+
+import atexit
+import threading
+from types import MappingProxyType
+from typing import Optional, Any, Dict, Tuple, Iterator, TYPE_CHECKING
+
+# pandas and the Snowflake connector are imported where they are used, so importing
+# this module (e.g. while Airflow parses the DAG) does not load them
+if TYPE_CHECKING:
+    import pyarrow as pa
+    from pandas import DataFrame
+
+# Live connections shared by every client in the process, keyed by the
+# full set of snowflake.connector.connect() arguments they were opened with
+_POOL: Dict[Tuple[Tuple[str, Any], ...], Any] = {}
+_POOL_LOCK = threading.Lock()
+
+
+def _drain_pool() -> None:
+   """Close every pooled connection; registered to run at interpreter exit"""
+   with _POOL_LOCK:
+       connections = list(_POOL.values())
+       _POOL.clear()
+   for conn in connections:
+       try:
+           if not conn.is_closed():
+               conn.close()
+       except Exception:
+           pass
+
+
+atexit.register(_drain_pool)
+
+
+def tuples_from_arrow(batch: pa.RecordBatch) -> Iterator[Tuple[Any, ...]]:
+   """Row tuples from an Arrow batch, for callers of fetch_arrow_batches that need tuple rows"""
+   return zip(*(column.to_pylist() for column in batch.columns))
 
 
 class SnowflakeQueryClient:
@@ -20,11 +53,19 @@ class SnowflakeQueryClient:
    - Query traceability with IDs
    """
 
-   def __init__(self, snowflake_creds: Dict[str, Any], snowflake_config: Dict[str, Any]):
-       """Initialize with separate credentials and config"""
+   def __init__(self, snowflake_creds: Dict[str, Any], snowflake_config: Dict[str, Any], freeze: bool = True):
+       """
+       Initialize with separate credentials and config.
+       With freeze (default) the client holds read-only views of the caller's dicts, so later
+       changes to those dicts are visible to it; pass freeze=False to keep private copies instead.
+       """
        self._validate_inputs(snowflake_creds, snowflake_config)
-       self.creds = snowflake_creds.copy()
-       self.config = snowflake_config.copy()
+       if freeze:
+           self.creds = MappingProxyType(snowflake_creds)
+           self.config = MappingProxyType(snowflake_config)
+       else:
+           self.creds = snowflake_creds.copy()
+           self.config = snowflake_config.copy()
        self.connection: Optional[Any] = None
 
    def _validate_inputs(self, creds: Dict[str, Any], config: Dict[str, Any]) -> None:
@@ -40,33 +81,63 @@ class SnowflakeQueryClient:
        if missing_config:
            raise ValueError(f"Missing config: {missing_config}")
 
-   def _create_connection(self) -> Any:
+   def _connect_params(self) -> Dict[str, Any]:
+       """Arguments for snowflake.connector.connect, which are also the connection's pool identity"""
+       params = {
+           'account': self.creds['account'],
+           'user': self.creds['user'],
+           'password': self.creds['password'],
+           'role': self.creds['role'],
+           'warehouse': self.creds['warehouse'],
+           'database': self.config['database'],
+           'schema': self.config['schema'],
+           'client_session_keep_alive': self.config.get('keep_alive', True),
+           'client_prefetch_threads': self.config.get('prefetch_threads', 4),
+           'network_timeout': self.config.get('network_timeout', 60),
+           'login_timeout': self.config.get('login_timeout', 15)
+       }
+       if 'authenticator' in self.creds:
+           params['authenticator'] = self.creds['authenticator']
+       return params
+
+   def _create_connection(self, params: Dict[str, Any]) -> Any:
        """Create new Snowflake connection"""
+       import snowflake.connector
+
        try:
-           conn = snowflake.connector.connect(
-               account=self.creds['account'],
-               user=self.creds['user'],
-               password=self.creds['password'],
-               role=self.creds['role'],
-               warehouse=self.creds['warehouse'],
-               database=self.config['database'],
-               schema=self.config['schema']
-           )
-           return conn
+           return snowflake.connector.connect(**params)
        except Exception as error:
            raise ConnectionError(f"Snowflake connection failed: {error}") from error
 
    def get_connection(self) -> Any:
-       """Get active connection, create if needed"""
-       if self.connection is None or self.connection.is_closed():
-           self.connection = self._create_connection()
+       """Get active connection from the process-wide pool, create if needed"""
+       if self.connection is not None and not self.connection.is_closed():
+           return self.connection
+       
+       params = self._connect_params()
+       pool_key = tuple(sorted(params.items()))
+       with _POOL_LOCK:
+           conn = _POOL.get(pool_key)
+           if conn is None or conn.is_closed():
+               conn = self._create_connection(params)
+               _POOL[pool_key] = conn
+       self.connection = conn
        return self.connection
 
+   def release_connection(self) -> None:
+       """Hand the active connection back to the pool; pooled connections are closed at exit"""
+       self.connection = None
+
    def close_connection(self) -> None:
-       """Close active connection"""
-       if self.connection and not self.connection.is_closed():
-           self.connection.close()
-           self.connection = None
+       """Close the active connection and drop it from the pool"""
+       conn, self.connection = self.connection, None
+       if conn is None:
+           return
+       with _POOL_LOCK:
+           for pool_key in [key for key, pooled in _POOL.items() if pooled is conn]:
+               del _POOL[pool_key]
+       if not conn.is_closed():
+           conn.close()
 
    def _get_query_id(self, cursor) -> Optional[str]:
        """Safely extract query ID from cursor"""
@@ -112,6 +183,14 @@ class SnowflakeQueryClient:
        finally:
            cursor.close()
 
+   def iter_dataframe_batches(self, query: str, query_params: Optional[Dict] = None) -> Iterator[DataFrame]:
+       """Execute query yielding one DataFrame per result chunk, so peak memory stays at chunk size"""
+       cursor, query_id = self._execute_query(query, query_params)
+       try:
+           yield from cursor.fetch_pandas_batches()
+       finally:
+           cursor.close()
+
    def fetch_all_rows_as_tuples(self, query: str, query_params: Optional[Dict] = None) -> Dict[str, Any]:
        """Execute query returning list of tuples"""
        cursor, query_id = self._execute_query(query, query_params)
@@ -124,6 +203,18 @@ class SnowflakeQueryClient:
        finally:
            cursor.close()
 
+   def fetch_arrow_batches(self, query: str, query_params: Optional[Dict] = None) -> Iterator[pa.RecordBatch]:
+       """
+       Execute query yielding Arrow record batches without building per-row Python tuples.
+       Unlike fetch_all_rows_as_tuples this streams columnar data; use tuples_from_arrow for row tuples.
+       """
+       cursor, query_id = self._execute_query(query, query_params)
+       try:
+           for table in cursor.fetch_arrow_batches():
+               yield from table.to_batches()
+       finally:
+           cursor.close()
+
    def execute_dml_query(self, query: str, query_params: Optional[Dict] = None) -> Dict[str, Any]:
        """Execute DML query (INSERT/UPDATE/DELETE)"""
        cursor, query_id = self._execute_query(query, query_params)
@@ -146,42 +237,35 @@ class SnowflakeQueryClient:
    def insert_one_record_only(self, record: Dict[str, Any], table: Optional[str] = None) -> Dict[str, Any]:
        """Insert a single record into Snowflake table"""
        target_table = table or self.config['table']
-       conn = self.get_connection()
+       columns = ', '.join(record.keys())
+       placeholders = ', '.join([f"%({k})s" for k in record.keys()])
+       query = f"INSERT INTO {target_table} ({columns}) VALUES ({placeholders})"
        
        try:
-            columns = ', '.join(record.keys())
-            placeholders = ', '.join([f"%({k})s" for k in record.keys()])
-
-            query = f"INSERT INTO {target_table} ({columns}) VALUES ({placeholders})"
-           self.execute_control_command(query, record)
-           
-           return {"query_id": cursor.sfqid, "num_rows_inserted": cursor.rowcount}
+           result = self.execute_dml_query(query, record)
+           return {"query_id": result["query_id"], "num_rows_inserted": result["rows_affected"]}
 
        except Exception as error:
            raise RuntimeError(f"Insert failed: {error}") from error
 
-               raise RuntimeError(f"Bulk insert failed for table {target_table}")
-           
-           return {
-               "query_id": query_id,
-               "num_rows_inserted": nrows
-           }
-           
-       except Exception as error:
-           raise RuntimeError(f"Bulk insert failed: {error}") from error
-
-
-
-
+   def bulk_insert_records(self, df: DataFrame, table: Optional[str] = None,
+                           chunk_size: Optional[int] = 100_000) -> Dict[str, Any]:
+       """
+       Bulk insert DataFrame to Snowflake table.
+       Staged as snappy Parquet with logical types, in chunk_size-row files (None = one file).
+       """
+       from snowflake.connector.pandas_tools import write_pandas
 
-   def bulk_insert_records(self, df: DataFrame, table: Optional[str] = None) -> Dict[str, Any]:
-       """Bulk insert DataFrame to Snowflake table"""
        target_table = table or self.config['table']
        conn = self.get_connection()
        
        try:
            success, nchunks, nrows, query_id = write_pandas(
-               conn, df, target_table, auto_create_table=False
+               conn, df, target_table,
+               chunk_size=chunk_size,
+               compression='snappy',
+               use_logical_type=True,
+               auto_create_table=False
            )
            
            if not success:
@@ -223,5 +307,5 @@ class SnowflakeQueryClient:
        return self
 
    def __exit__(self, exc_type, exc_val, exc_tb):
-       """Context manager exit with cleanup"""
-       self.close_connection()
\ No newline at end of file
+       """Context manager exit; the connection stays pooled for the next client"""
+       self.release_connection()
\ No newline at end of file
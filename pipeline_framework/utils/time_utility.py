@@ -6,21 +6,67 @@ All timestamps stored as ISO strings for safety.
 Supports: pendulum, datetime, arrow, dateutil, pandas, numpy datetime
 """
 
+import re
+import threading
+import time
 import pendulum
-from typing import Union, Optional, Any
-from datetime import datetime, date
-from utils.log_generator import setup_pipeline_logger
+from typing import Union, Optional, Any, Dict, Tuple
+from datetime import datetime, date, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+from pipeline_framework.utils.lazy_logger import LazyPipelineLogger
 
-log = setup_pipeline_logger(logger_name="TimeUtility")
+log = LazyPipelineLogger("TimeUtility")
+
+_ISO_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}')
+
+# Last "now" ISO string per timezone; calls within the TTL reuse it instead of re-formatting
+_NOW_CACHE: Dict[str, Tuple[float, str]] = {}
+_NOW_CACHE_LOCK = threading.Lock()
+_NOW_CACHE_TTL_SECONDS = 0.1
+
+# ZoneInfo per timezone name, built once
+_ZONES: Dict[str, ZoneInfo] = {}
+
+
+def _zone(timezone: str) -> ZoneInfo:
+    """Cached ZoneInfo for a timezone name; raises for unknown names"""
+    zone = _ZONES.get(timezone)
+    if zone is None:
+        zone = _ZONES[timezone] = ZoneInfo(timezone)
+    return zone
+
+
+def _format_zoned(dt: datetime, timezone: str) -> str:
+    """ISO string of dt in a named zone, written as pendulum does ('Z' for UTC, offset otherwise)"""
+    iso = dt.isoformat()
+    if timezone == "UTC" and iso.endswith('+00:00'):
+        iso = iso[:-6] + 'Z'
+    return iso
 
 
 def get_current_time_iso(timezone: str = "UTC") -> str:
-    """Get current time as ISO string in specified timezone"""
+    """Get current time as ISO string in specified timezone (memoized for 100ms per timezone)"""
+    now_monotonic = time.monotonic()
+    with _NOW_CACHE_LOCK:
+        cached = _NOW_CACHE.get(timezone)
+    if cached and now_monotonic - cached[0] < _NOW_CACHE_TTL_SECONDS:
+        return cached[1]
+    
     try:
-        return pendulum.now(timezone).to_iso8601_string()
+        now_iso = _format_zoned(datetime.now(_zone(timezone)), timezone)
     except Exception as e:
         log.warning(f"Timezone '{timezone}' failed, using UTC", error=str(e))
-        return pendulum.now("UTC").to_iso8601_string()
+        now_iso = _format_zoned(datetime.now(_zone("UTC")), "UTC")
+    
+    with _NOW_CACHE_LOCK:
+        _NOW_CACHE[timezone] = (now_monotonic, now_iso)
+    return now_iso
+
+
+def invalidate_now_cache() -> None:
+    """Drop memoized get_current_time_iso values (for tests that move the clock)"""
+    with _NOW_CACHE_LOCK:
+        _NOW_CACHE.clear()
 
 
 def to_iso_string(time_input: Any, timezone: str = "UTC") -> str:
@@ -32,13 +78,14 @@ def to_iso_string(time_input: Any, timezone: str = "UTC") -> str:
         return None
     
     try:
+        # Exact built-in types resolve with one dict lookup; subclasses and third-party types use the ladder
+        handler = _DISPATCH.get(type(time_input))
+        if handler is not None:
+            return handler(time_input, timezone)
+        
         # Already a string - validate and return
         if isinstance(time_input, str):
-            # Check if already ISO format
-            if _is_iso_format(time_input):
-                return time_input
-            # Try parsing as date/time string
-            return pendulum.parse(time_input, tz=timezone).to_iso8601_string()
+            return _from_str(time_input, timezone)
         
         # Pendulum objects
         elif hasattr(time_input, 'to_iso8601_string'):
@@ -46,16 +93,10 @@ def to_iso_string(time_input: Any, timezone: str = "UTC") -> str:
         
         # Python datetime/date objects
         elif isinstance(time_input, datetime):
-            if time_input.tzinfo is None:
-                # Naive datetime - assume timezone
-                return pendulum.instance(time_input, tz=timezone).to_iso8601_string()
-            else:
-                # Timezone-aware datetime
-                return pendulum.instance(time_input).to_iso8601_string()
+            return _from_datetime(time_input, timezone)
         
         elif isinstance(time_input, date):
-            # Date only - convert to start of day
-            return pendulum.parse(str(time_input), tz=timezone).to_iso8601_string()
+            return _from_date(time_input, timezone)
         
         # Arrow objects (if available)
         elif hasattr(time_input, 'isoformat') and hasattr(time_input, 'timestamp'):
@@ -76,7 +117,7 @@ def to_iso_string(time_input: Any, timezone: str = "UTC") -> str:
         
         # Unix timestamp (int/float)
         elif isinstance(time_input, (int, float)):
-            return pendulum.from_timestamp(time_input, tz=timezone).to_iso8601_string()
+            return _from_unix(time_input, timezone)
         
         # Generic objects with isoformat method
         elif hasattr(time_input, 'isoformat'):
@@ -101,17 +142,80 @@ def to_iso_string(time_input: Any, timezone: str = "UTC") -> str:
         raise ValueError(f"Cannot convert {type(time_input)} to ISO string: {e}")
 
 
+def _from_str(time_input: str, timezone: str) -> str:
+    """ISO strings pass through; anything else is parsed in the given timezone"""
+    if _is_iso_format(time_input):
+        return time_input
+    return pendulum.parse(time_input, tz=timezone).to_iso8601_string()
+
+
+def _from_datetime(time_input: datetime, timezone: str) -> str:
+    """Naive datetimes are assumed to be in the given timezone; aware ones format via datetime.isoformat"""
+    if time_input.tzinfo is None or time_input.utcoffset() is None:
+        return pendulum.instance(time_input, tz=timezone).to_iso8601_string()
+    iso = time_input.isoformat()
+    # Only a UTC zone is written as 'Z'; zero-offset zones such as Europe/London in winter keep '+00:00'
+    if _is_utc(time_input.tzinfo) and iso.endswith('+00:00'):
+        iso = iso[:-6] + 'Z'
+    return iso
+
+
+def _is_utc(tzinfo: Any) -> bool:
+    """True for tzinfo objects pendulum writes as 'Z' (datetime.timezone.utc or a zone named UTC)"""
+    return tzinfo is dt_timezone.utc or getattr(tzinfo, 'key', None) == "UTC" or getattr(tzinfo, 'name', None) == "UTC"
+
+
+def _from_date(time_input: date, timezone: str) -> str:
+    """Date only - start of day in the given timezone"""
+    return pendulum.parse(str(time_input), tz=timezone).to_iso8601_string()
+
+
+def _from_unix(time_input: Union[int, float], timezone: str) -> str:
+    """Unix timestamp in seconds"""
+    return pendulum.from_timestamp(time_input, tz=timezone).to_iso8601_string()
+
+
+_DISPATCH = {
+    str: _from_str,
+    datetime: _from_datetime,
+    date: _from_date,
+    int: _from_unix,
+    float: _from_unix
+}
+
+
 def _is_iso_format(time_str: str) -> bool:
-    """Check if string is already in ISO format"""
+    """Check if string is already in ISO format (shape check only, no parse)"""
+    return _ISO_PATTERN.match(time_str) is not None
+
+
+def _fast_parse(time_str: str) -> datetime:
+    """
+    Parse an ISO string with datetime.fromisoformat, falling back to pendulum for anything else.
+    Strings without an offset are treated as UTC, matching pendulum.parse.
+    """
     try:
-        # Basic ISO format checks
-        if 'T' in time_str and (':' in time_str):
-            # Try parsing to validate
-            pendulum.parse(time_str)
-            return True
-        return False
-    except:
-        return False
+        dt = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
+    except ValueError:
+        return pendulum.parse(time_str)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=dt_timezone.utc)
+    return dt
+
+
+def _to_datetime(time_input: Any) -> datetime:
+    """Any supported timestamp -> aware datetime, skipping the ISO round-trip for ISO strings"""
+    if isinstance(time_input, str) and _is_iso_format(time_input):
+        return _fast_parse(time_input)
+    return _fast_parse(to_iso_string(time_input))
+
+
+def _format_iso(dt: datetime, source_iso: str) -> str:
+    """ISO string of dt; a zero offset is written as 'Z' unless the source spelled it '+00:00' (as pendulum does)"""
+    iso = dt.isoformat()
+    if iso.endswith('+00:00') and not source_iso.endswith('+00:00'):
+        iso = iso[:-6] + 'Z'
+    return iso
 
 
 def parse_to_iso(time_input: Any, timezone: str = "UTC") -> str:
@@ -121,14 +225,14 @@ def parse_to_iso(time_input: Any, timezone: str = "UTC") -> str:
 
 def add_duration_to_iso(iso_time: str, seconds: int) -> str:
     """Add seconds to ISO time string, return ISO string"""
-    dt = pendulum.parse(iso_time)
-    return dt.add(seconds=seconds).to_iso8601_string()
+    dt = _fast_parse(iso_time)
+    return _format_iso(dt + timedelta(seconds=seconds), iso_time)
 
 
 def subtract_duration_from_iso(iso_time: str, seconds: int) -> str:
     """Subtract seconds from ISO time string, return ISO string"""
-    dt = pendulum.parse(iso_time)
-    return dt.subtract(seconds=seconds).to_iso8601_string()
+    dt = _fast_parse(iso_time)
+    return _format_iso(dt - timedelta(seconds=seconds), iso_time)
 
 
 def get_start_of_day_iso(date_input: Any, timezone: str = "UTC") -> str:
@@ -153,28 +257,16 @@ def get_date_only(time_input: Any) -> str:
 
 def calculate_duration_seconds(start_time: Any, end_time: Any) -> int:
     """Calculate duration in seconds between two timestamps"""
-    start_iso = to_iso_string(start_time)
-    end_iso = to_iso_string(end_time)
-    
-    start_dt = pendulum.parse(start_iso)
-    end_dt = pendulum.parse(end_iso)
+    start_dt = _to_datetime(start_time)
+    end_dt = _to_datetime(end_time)
     return int((end_dt - start_dt).total_seconds())
 
 
 def compare_times(time1: Any, time2: Any) -> int:
     """Compare two timestamps. Returns: -1 (time1 < time2), 0 (equal), 1 (time1 > time2)"""
-    iso1 = to_iso_string(time1)
-    iso2 = to_iso_string(time2)
-    
-    dt1 = pendulum.parse(iso1)
-    dt2 = pendulum.parse(iso2)
-    
-    if dt1 < dt2:
-        return -1
-    elif dt1 > dt2:
-        return 1
-    else:
-        return 0
+    dt1 = _to_datetime(time1)
+    dt2 = _to_datetime(time2)
+    return (dt1 > dt2) - (dt1 < dt2)
 
 
 def is_timezone_aware(time_input: Any) -> bool:
@@ -189,9 +281,8 @@ def is_timezone_aware(time_input: Any) -> bool:
 
 def convert_timezone(time_input: Any, target_timezone: str) -> str:
     """Convert timestamp to different timezone, return ISO string"""
-    iso_time = to_iso_string(time_input)
-    dt = pendulum.parse(iso_time)
-    return dt.in_timezone(target_timezone).to_iso8601_string()
+    dt = _to_datetime(time_input)
+    return _format_zoned(dt.astimezone(_zone(target_timezone)), target_timezone)
 
 
 def format_for_display(time_input: Any, timestamp_format_str: str = "%Y-%m-%d %H:%M:%S %Z") -> str:
@@ -0,0 +1,107 @@
+# pipeline_framework/xcom_s3_backend.py
+
+"""
+XCom backend that keeps task payloads in S3 and stores only a reference in the metadata DB.
+
+Enable it on the scheduler and workers with:
+    AIRFLOW__CORE__XCOM_BACKEND=pipeline_framework.xcom_s3_backend.S3XComBackend
+    XCOM_S3_BUCKET=<bucket>              (required, otherwise XComs stay in the DB)
+    XCOM_S3_PREFIX=<prefix>              (optional, defaults to 'xcom')
+    XCOM_S3_MIN_BYTES=<bytes>            (optional, defaults to 65536; smaller payloads stay in the DB)
+S3 credentials come from the standard boto3 chain (instance role, env vars, ...).
+
+Objects are deleted when Airflow clears an XCom (task retry/clear, XCom.delete) through purge().
+`airflow db clean` and DAG run deletion drop XCom rows without calling purge(), so also put an
+S3 lifecycle expiration rule on <prefix>/ that outlives the metadata DB retention.
+"""
+
+import functools
+import json
+import os
+from typing import Any, Optional
+import boto3
+from airflow.models.xcom import BaseXCom
+
+_XCOM_S3_BUCKET = os.environ.get('XCOM_S3_BUCKET')
+_XCOM_S3_PREFIX = os.environ.get('XCOM_S3_PREFIX', 'xcom').strip('/')
+
+# JSON payloads below this size are kept in the metadata DB; the S3 round trip costs more than the row
+_XCOM_S3_MIN_BYTES = int(os.environ.get('XCOM_S3_MIN_BYTES', 65536))
+
+# Marker key of the small dict that is stored in the metadata DB in place of the payload
+_REF_KEY = '_ref'
+
+
+@functools.lru_cache(maxsize=None)
+def _get_s3_client():
+    """One S3 client per process for XCom reads/writes"""
+    return boto3.client('s3')
+
+
+def _object_key(dag_id: str, run_id: str, task_id: str, key: str, map_index: Optional[int]) -> str:
+    """s3 key for one XCom: <prefix>/<dag_id>/<run_id>/<task_id>[_<map_index>]/<key>.json"""
+    task_part = task_id if map_index is None or map_index < 0 else f"{task_id}_{map_index}"
+    return f"{_XCOM_S3_PREFIX}/{dag_id}/{run_id}/{task_part}/{key}.json"
+
+
+def _is_reference(value: Any) -> bool:
+    """True for the {'_ref': 's3://...'} dict stored in place of an offloaded payload"""
+    return isinstance(value, dict) and set(value) == {_REF_KEY}
+
+
+def _split_uri(uri: str):
+    """Split 's3://bucket/key' into (bucket, key)"""
+    bucket, _, key = uri[len('s3://'):].partition('/')
+    return bucket, key
+
+
+class S3XComBackend(BaseXCom):
+    """Serializes large XCom values once to S3 as JSON and keeps {'_ref': 's3://...'} in the DB"""
+
+    @staticmethod
+    def serialize_value(value: Any, *, key: Optional[str] = None, task_id: Optional[str] = None,
+                        dag_id: Optional[str] = None, run_id: Optional[str] = None,
+                        map_index: Optional[int] = None, **kwargs) -> Any:
+        if value is None or not _XCOM_S3_BUCKET:
+            return BaseXCom.serialize_value(value, key=key, task_id=task_id, dag_id=dag_id,
+                                            run_id=run_id, map_index=map_index)
+
+        body = json.dumps(value).encode('utf-8')
+        if len(body) < _XCOM_S3_MIN_BYTES:
+            return BaseXCom.serialize_value(value, key=key, task_id=task_id, dag_id=dag_id,
+                                            run_id=run_id, map_index=map_index)
+
+        object_key = _object_key(dag_id, run_id, task_id, key, map_index)
+        _get_s3_client().put_object(
+            Bucket=_XCOM_S3_BUCKET,
+            Key=object_key,
+            Body=body,
+            ContentType='application/json'
+        )
+        reference = {_REF_KEY: f"s3://{_XCOM_S3_BUCKET}/{object_key}"}
+        return BaseXCom.serialize_value(reference, key=key, task_id=task_id, dag_id=dag_id,
+                                        run_id=run_id, map_index=map_index)
+
+    @staticmethod
+    def deserialize_value(result) -> Any:
+        value = BaseXCom.deserialize_value(result)
+        if not _is_reference(value):
+            return value
+
+        bucket, object_key = _split_uri(value[_REF_KEY])
+        response = _get_s3_client().get_object(Bucket=bucket, Key=object_key)
+        return json.loads(response['Body'].read())
+
+    def orm_deserialize_value(self) -> Any:
+        """UI/list views render the stored reference without fetching the payload from S3"""
+        return BaseXCom.deserialize_value(self)
+
+    @staticmethod
+    def purge(xcom, session) -> None:
+        """Delete the S3 payload of an XCom row Airflow is clearing; rows stored inline need nothing"""
+        value = BaseXCom.deserialize_value(xcom)
+        if not _is_reference(value):
+            return
+
+        bucket, object_key = _split_uri(value[_REF_KEY])
+        _get_s3_client().delete_object(Bucket=bucket, Key=object_key)
@@ -6,7 +6,8 @@ import sys
 from datetime import timedelta
 import pendulum
 from airflow import DAG
-from airflow.operators.python import PythonOperator
+from airflow.models.baseoperator import chain
+from airflow.operators.python import PythonOperator, ShortCircuitOperator
 
 # Add pipeline_framework to Python path
 
@@ -16,7 +17,7 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 
-from pipeline_framework.configs_handler_func import get_final_config
+from pipeline_framework.configs_handler_func import get_cached_final_config
 from pipeline_framework.task_handlers import (
     record_generator_task,
     pick_pending_record_task,
@@ -32,45 +33,71 @@ root_project_path = PROJECT_ROOT
 drive_defaults_relative_path = "pipeline_logic/drive_table_defaults.json"
 index_config_relative_path = "projects/group_name/name/name.json"
 
-final_config = get_final_config(
-    root_project_path=root_project_path,
-    drive_defaults_relative_path=drive_defaults_relative_path,
-    index_config_relative_path=index_config_relative_path
+# Tasks get only these paths (via op_kwargs) and load the config themselves, keeping it out of the serialized DAG
+config_ref = {
+    "root": root_project_path,
+    "drive": drive_defaults_relative_path,
+    "index": index_config_relative_path
+}
+
+# Memoized on the config files' mtimes, so unchanged JSON is not re-read on every DAG parse
+final_config = get_cached_final_config(
+    root_project_path,
+    index_config_relative_path,
+    drive_defaults_relative_path
 )
 
 # Email settings from config
 email_recipients = final_config.get("email_recipients", ["alerts@company.com"])
 
+# Evaluated once per process import, reused by default_args
+_START_DATE = pendulum.datetime(2025, 1, 1, tz=final_config.get("timezone", "UTC"))
+_RETRY_DELAY = timedelta(minutes=5)
+
 # DAG configuration
 default_args = {
     'owner': 'data-team',
     'depends_on_past': False,
-    'start_date': pendulum.datetime(2025, 1, 1, tz=final_config.get("timezone", "UTC")),
+    'start_date': _START_DATE,
     'email_on_failure': final_config.get("email_on_failure", True),
     'email_on_retry': final_config.get("email_on_retry", False),
     'email': email_recipients,
     'retries': 3,
-    'retry_delay': timedelta(minutes=5),
+    'retry_delay': _RETRY_DELAY,
 }
 
 dag = DAG(
     dag_id="namexyz_main_data_pipeline",
     default_args=default_args,
     description='Ingestion process ES→S3→SF ',
-    schedule_interval="0 * * * *",  # Every hour
+    schedule_interval=final_config.get("schedule_interval", "0 * * * *"),  # Every hour by default
     catchup=False,
-    max_active_runs=1,
-    params={'final_config': final_config}
+    max_active_runs=1
 )
 
-# Tasks
-record_gen = PythonOperator(task_id='record_generator_task', python_callable=record_generator_task, dag=dag)
-pick_record = PythonOperator(task_id='pick_pending_record_task', python_callable=pick_pending_record_task, dag=dag)
-# validate = PythonOperator(task_id='validate_record_task', python_callable=validate_record_task, dag=dag)
-source_stage = PythonOperator(task_id='source_to_stage_task', python_callable=source_to_stage_task, dag=dag)
-stage_target = PythonOperator(task_id='stage_to_target_task', python_callable=stage_to_target_task, dag=dag)
-audit_data = PythonOperator(task_id='audit_task', python_callable=audit_task, dag=dag)
-cleanup = PythonOperator(task_id='cleanup_stale_locks_task', python_callable=cleanup_stale_locks_task, trigger_rule='all_done', dag=dag)
+# Pools: ES/S3/Snowflake transfers can get a small pool so bookkeeping tasks are not starved.
+# Opt-in: create the pools first (e.g. airflow pools set io_heavy 4 "transfers") and name them in the
+# config as io_heavy_pool / cpu_light_pool; unset, every task runs in default_pool
+io_heavy_pool = final_config.get("io_heavy_pool", "default_pool")
+cpu_light_pool = final_config.get("cpu_light_pool", "default_pool")
+
+# Tasks: (task_id, operator class, callable, extra operator kwargs), in execution order.
+# pick_pending_record_task short-circuits when nothing is PENDING: the transfer/audit tasks
+# are skipped while cleanup_stale_locks_task (all_done) still runs.
+TASKS = [
+    ("record_generator_task", PythonOperator, record_generator_task, {"pool": cpu_light_pool}),
+    ("pick_pending_record_task", ShortCircuitOperator, pick_pending_record_task, {"pool": cpu_light_pool, "ignore_downstream_trigger_rules": False}),
+    # ("validate_record_task", PythonOperator, validate_record_task, {"pool": cpu_light_pool}),
+    ("source_to_stage_task", PythonOperator, source_to_stage_task, {"pool": io_heavy_pool}),
+    ("stage_to_target_task", PythonOperator, stage_to_target_task, {"pool": io_heavy_pool}),
+    ("audit_task", PythonOperator, audit_task, {"pool": cpu_light_pool}),
+    ("cleanup_stale_locks_task", PythonOperator, cleanup_stale_locks_task, {"pool": cpu_light_pool, "trigger_rule": "all_done"}),
+]
+
+ops = [
+    operator_cls(task_id=task_id, python_callable=python_callable, op_kwargs={'config_ref': config_ref}, dag=dag, **operator_kwargs)
+    for task_id, operator_cls, python_callable, operator_kwargs in TASKS
+]
 
 # Dependencies
-record_gen >> pick_record >> source_stage >> stage_target >> audit_data >> cleanup
\ No newline at end of file
+chain(*ops)
@@ -0,0 +1,318 @@
+# conftest.py
+
+"""Shared fixtures and test data for pipeline_framework tests, built lazily by pytest fixtures"""
+
+import importlib
+import io
+import os
+import sys
+import types
+import pytest
+
+# Repo root, so tests import the package as `pipeline_framework.*`
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class RecordingLogger:
+    """Stands in for the setup_pipeline_logger logger; keeps (level, message, fields) per call"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, level):
+        def log(message, *args, **fields):
+            self.calls.append((level, message, fields))
+        return log
+
+
+@pytest.fixture(autouse=True)
+def pipeline_logger(monkeypatch):
+    """Route every LazyPipelineLogger to one RecordingLogger for the test"""
+    from pipeline_framework.utils import lazy_logger
+    logger = RecordingLogger()
+    monkeypatch.setattr(lazy_logger, 'get_pipeline_logger', lambda logger_name: logger)
+    return logger
+
+
+@pytest.fixture
+def import_with_stub_retry(monkeypatch):
+    """
+    Import function for modules that use log_retry_decorators, which is not part of this tree.
+    A pass-through stub stands in for it, and modules first imported during the test are dropped afterwards.
+    """
+    stub = types.ModuleType('pipeline_framework.utils.log_retry_decorators')
+    stub.retry = lambda *args, **kwargs: (lambda func: func)
+    stub.log_execution_time = lambda func: func
+    monkeypatch.setitem(sys.modules, stub.__name__, stub)
+    preloaded = set(sys.modules)
+    yield importlib.import_module
+    for name in set(sys.modules) - preloaded:
+        del sys.modules[name]
+
+
+class FakeQueryClient:
+    """Stands in for SnowflakeQueryClient; records every (query, params) sent, across all instances"""
+
+    executed = []
+    rows_affected = 1
+    scalar = None
+
+    def __init__(self, snowflake_creds, snowflake_config):
+        self.config = snowflake_config
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def execute_dml_query(self, query, query_params=None):
+        FakeQueryClient.executed.append((query, query_params))
+        return {"query_id": f"qid-{len(FakeQueryClient.executed)}", "rows_affected": FakeQueryClient.rows_affected}
+
+    def execute_scalar_query(self, query, query_params=None):
+        FakeQueryClient.executed.append((query, query_params))
+        return {"query_id": f"qid-{len(FakeQueryClient.executed)}", "data": FakeQueryClient.scalar}
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    """FakeQueryClient, reset and swapped in wherever the pipeline builds a SnowflakeQueryClient"""
+    from pipeline_framework import drive_record_adapter, snowflake_operations
+    FakeQueryClient.executed = []
+    FakeQueryClient.rows_affected = 1
+    FakeQueryClient.scalar = None
+    monkeypatch.setattr(drive_record_adapter, 'SnowflakeQueryClient', FakeQueryClient)
+    monkeypatch.setattr(snowflake_operations, 'SnowflakeQueryClient', FakeQueryClient)
+    return FakeQueryClient
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.sfqid = f"qid-{len(connection.executed) + 1}"
+        self.rowcount = 1
+
+    def execute(self, query, params):
+        self.connection.executed.append((query, params))
+
+    def fetchone(self):
+        return (42,)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def connect_calls(monkeypatch):
+    """Replace snowflake.connector.connect and empty the process-wide pool around the test"""
+    import snowflake.connector
+    from pipeline_framework.utils import snowflake_utils
+    calls = []
+
+    def fake_connect(**kwargs):
+        calls.append(kwargs)
+        return FakeConnection()
+
+    monkeypatch.setattr(snowflake.connector, 'connect', fake_connect)
+    snowflake_utils._drain_pool()
+    yield calls
+    snowflake_utils._drain_pool()
+
+
+class FakePageIterator(list):
+    def search(self, expression):
+        assert expression == 'Contents[].Key'
+        for page in self:
+            for obj in page.get('Contents', []):
+                yield obj['Key']
+
+
+class FakeS3:
+    """In-memory object store speaking the boto3 S3 client subset the pipeline uses, keyed by (Bucket, Key)"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def add(self, bucket, *keys):
+        """Store an empty object under each key"""
+        for key in keys:
+            self.objects[(bucket, key)] = b''
+
+    def _list(self, bucket, prefix):
+        return [{'Key': key} for obj_bucket, key in sorted(self.objects) if obj_bucket == bucket and key.startswith(prefix)]
+
+    def get_paginator(self, name):
+        fake = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix, **kwargs):
+                contents = fake._list(Bucket, Prefix)
+                pages = [{'Contents': contents[i:i + 2], 'KeyCount': len(contents[i:i + 2])}
+                         for i in range(0, len(contents), 2)] or [{'KeyCount': 0}]
+                return FakePageIterator(pages)
+
+        return Paginator()
+
+    def list_objects_v2(self, Bucket, Prefix, MaxKeys=1000):
+        contents = self._list(Bucket, Prefix)[:MaxKeys]
+        return {'Contents': contents, 'KeyCount': len(contents)} if contents else {'KeyCount': 0}
+
+    def delete_objects(self, Bucket, Delete):
+        for obj in Delete['Objects']:
+            self.objects.pop((Bucket, obj['Key']), None)
+        return {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[(Bucket, Key)] = Body
+
+    def get_object(self, Bucket, Key):
+        return {'Body': io.BytesIO(self.objects[(Bucket, Key)])}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+@pytest.fixture
+def fake_s3():
+    """Empty FakeS3; test modules override this fixture to patch it in as their module's client"""
+    return FakeS3()
+
+
+@pytest.fixture(scope="session")
+def final_config():
+    """Resolved pipeline config as record_generator sees it (drive record keys are UPPERCASE)"""
+    return {
+        "x_time_back": "1d",
+        "granularity": "2h",
+        "timezone": "America/New_York",
+        "index_group": "app_logs",
+        "index_name": "application_events",
+        "s3_bucket": "data-lake-bucket",
+        "s3_prefix_list": ["raw", "logs"],
+        "target_database": "RAW_DATA",
+        "target_schema": "LOGS",
+        "target_table": "APPLICATION_LOGS",
+        "drive_table_default_record": {
+            "SOURCE_ID": None,
+            "SOURCE_NAME": "elasticsearch",
+            "SOURCE_CATEGORY": None,
+            "SOURCE_SUB_CATEGORY": None,
+        
+            "STAGE_ID": None,
+            "STAGE_NAME": "aws_s3",
+            "STAGE_CATEGORY": None,
+            "STAGE_SUB_CATEGORY": None,
+        
+            "TARGET_ID": None,
+            "TARGET_NAME": "snowflake",
+            "TARGET_CATEGORY": None,
+            "TARGET_SUB_CATEGORY": None,
+        
+            "SOURCE_TO_STAGE_INGESTION_START_TIME": None,
+            "SOURCE_TO_STAGE_INGESTION_END_TIME": None,
+            "SOURCE_TO_STAGE_INGESTION_STATUS": "PENDING",
+        
+            "STAGE_TO_TARGET_INGESTION_START_TIME": None,
+            "STAGE_TO_TARGET_INGESTION_END_TIME": None,
+            "STAGE_TO_TARGET_INGESTION_STATUS": "PENDING",
+        
+            "AUDIT_START_TIME": None,
+            "AUDIT_END_TIME": None,
+            "AUDIT_STATUS": "PENDING",
+            "AUDIT_RESULT": None,
+        
+            "PIPELINE_ID": None,
+            "PIPELINE_START_TIME": None,
+            "PIPELINE_END_TIME": None,
+            "PIPELINE_STATUS": "PENDING",
+            "PIPELINE_PRIORITY": 1.1,
+        
+            "DAG_RUN_ID": None,
+            "COMPLETED_PHASE": None,
+            "RETRY_ATTEMPT": 0,
+            "GRANULARITY": None,
+            "WINDOW_START_TIME": None,
+            "WINDOW_END_TIME": None,
+            "TARGET_DAY": None,
+            "MISCELLANEOUS": None,
+            "RECORD_FIRST_CREATED_TIME": None,
+            "RECORD_LAST_UPDATED_TIME": None
+        }
+    }
+
+
+@pytest.fixture
+def existing_records_sample():
+    """Drive records already present for the target day (using ISO strings)"""
+    return [
+        {
+            'WINDOW_START_TIME': '2025-06-27T02:00:00-04:00',
+            'WINDOW_END_TIME': '2025-06-27T04:00:00-04:00',
+            'PIPELINE_ID': 'abc123_test',
+            'SOURCE_ID': 'src_test_1',
+            'STAGE_ID': 'stg_test_1',
+            'TARGET_ID': 'tgt_test_1'
+        },
+        {
+            'WINDOW_START_TIME': '2025-06-27T04:00:00-04:00',
+            'WINDOW_END_TIME': '2025-06-27T06:00:00-04:00',
+            'PIPELINE_ID': 'abc123_test',
+            'SOURCE_ID': 'src_test_2',
+            'STAGE_ID': 'stg_test_2',
+            'TARGET_ID': 'tgt_test_2'
+        }
+    ]
+
+
+@pytest.fixture
+def boundary_records():
+    return [
+        {
+            'WINDOW_START_TIME': '2025-06-27T20:00:00-04:00',
+            'WINDOW_END_TIME': '2025-06-27T22:00:00-04:00',
+            'PIPELINE_ID': 'boundary_test_1',
+            'SOURCE_ID': 'src_boundary',
+            'STAGE_ID': 'stg_boundary',
+            'TARGET_ID': 'tgt_boundary'
+        }
+    ]
+
+
+@pytest.fixture
+def short_records():
+    return [
+        {
+            'WINDOW_START_TIME': '2025-06-27T21:30:00-04:00',
+            'WINDOW_END_TIME': '2025-06-27T23:30:00-04:00',
+            'PIPELINE_ID': 'short_test_1',
+            'SOURCE_ID': 'src_short',
+            'STAGE_ID': 'stg_short',
+            'TARGET_ID': 'tgt_short'
+        }
+    ]
+
+
+@pytest.fixture(scope="session")
+def boundary_config(final_config):
+    return {**final_config, 'granularity': '4h'}
+
+
+@pytest.fixture(scope="session")
+def short_config(final_config):
+    return {**final_config, 'granularity': '2h'}
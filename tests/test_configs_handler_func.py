@@ -0,0 +1,64 @@
+# test_configs_handler_func.py
+
+import json
+import pytest
+
+pytest.importorskip('airflow')
+
+from pipeline_framework import configs_handler_func
+from pipeline_framework.configs_handler_func import get_cached_final_config
+
+TEAM_CONFIG = {'es_hostname': 'es_prod', 'index_group': 'app_logs', 'index_name': 'application_events',
+               's3_prefix_list': ['{env}', '{index_group}']}
+DRIVE_TEMPLATE = {'SOURCE_CATEGORY': None, 'SOURCE_SUB_CATEGORY': None, 'PIPELINE_ID': None}
+
+
+@pytest.fixture
+def variables(monkeypatch):
+    """Airflow Variable store backed by a dict the test can change between calls"""
+    store = {'env': 'dev'}
+
+    def fake_get(key, default_var=None):
+        return store.get(key, default_var if default_var is not None else f'<{key}>')
+
+    monkeypatch.setattr(configs_handler_func.Variable, 'get', staticmethod(fake_get))
+    return store
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    (tmp_path / 'team.json').write_text(json.dumps(TEAM_CONFIG))
+    (tmp_path / 'drive.json').write_text(json.dumps(DRIVE_TEMPLATE))
+    configs_handler_func._cached_config_files.cache_clear()
+    loads = []
+    load_json_file = configs_handler_func.load_json_file
+    monkeypatch.setattr(configs_handler_func, 'load_json_file', lambda path: loads.append(path) or load_json_file(path))
+    yield str(tmp_path), loads
+    configs_handler_func._cached_config_files.cache_clear()
+
+
+def test_cached_config_reads_files_once_but_picks_up_variable_changes(project, variables):
+    root, loads = project
+
+    first = get_cached_final_config(root, 'team.json', 'drive.json')
+    variables['env'] = 'prod'
+    variables['snowflake_password'] = 'rotated'
+    second = get_cached_final_config(root, 'team.json', 'drive.json')
+
+    assert len(loads) == 2
+    assert first['s3_prefix_list'] == ['dev', 'app_logs']
+    assert second['s3_prefix_list'] == ['prod', 'app_logs']
+    assert second['sf_password'] == 'rotated'
+    assert second['drive_table_default_record']['SOURCE_CATEGORY'] is None
+
+
+def test_cached_config_returns_independent_copies(project, variables):
+    root, _ = project
+
+    first = get_cached_final_config(root, 'team.json', 'drive.json')
+    first['s3_prefix_list'].append('mutated')
+    first['drive_table_default_record']['PIPELINE_ID'] = 'p1'
+
+    second = get_cached_final_config(root, 'team.json', 'drive.json')
+    assert second['s3_prefix_list'] == ['dev', 'app_logs']
+    assert second['drive_table_default_record']['PIPELINE_ID'] is None
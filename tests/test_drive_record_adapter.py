@@ -0,0 +1,101 @@
+# test_drive_record_adapter.py
+
+import json
+import pytest
+
+from pipeline_framework.drive_record_adapter import (
+    insert_drive_records, insert_drive_record, lock_record_for_processing
+)
+
+
+@pytest.fixture
+def drive_config():
+    return {
+        'snowflake_account': 'acct',
+        'snowflake_user': 'user',
+        'snowflake_password': 'pw',
+        'snowflake_role': 'role',
+        'snowflake_warehouse': 'wh',
+        'drive_database': 'PIPELINE_CONTROL',
+        'drive_schema': 'ORCHESTRATION',
+        'drive_table': 'PIPELINE_RECORDS',
+        'timezone': 'UTC'
+    }
+
+
+def _record(pipeline_id, window_start, window_end, miscellaneous=None):
+    return {
+        'PIPELINE_ID': pipeline_id,
+        'WINDOW_START_TIME': window_start,
+        'WINDOW_END_TIME': window_end,
+        'RETRY_ATTEMPT': 0,
+        'MISCELLANEOUS': miscellaneous
+    }
+
+
+def test_insert_drive_records_writes_all_rows_in_one_statement(fake_client, drive_config):
+    records = [
+        _record('p1', '2025-06-27T00:00:00-04:00', '2025-06-27T01:00:00-04:00'),
+        _record('p2', '2025-06-27T01:00:00-04:00', '2025-06-27T02:00:00-04:00'),
+    ]
+    fake_client.rows_affected = 2
+
+    result = insert_drive_records(records, drive_config)
+
+    assert result == {"query_id": "qid-1", "rows_affected": 2}
+    assert len(fake_client.executed) == 1
+    query, params = fake_client.executed[0]
+    assert "INSERT INTO PIPELINE_CONTROL.ORCHESTRATION.PIPELINE_RECORDS" in query
+    assert "(PIPELINE_ID, WINDOW_START_TIME, WINDOW_END_TIME, RETRY_ATTEMPT, MISCELLANEOUS)" in query
+    assert "SELECT $1, $2, $3, $4, $5" in query
+    assert "(%(r0_c0)s, %(r0_c1)s, %(r0_c2)s, %(r0_c3)s, %(r0_c4)s), (%(r1_c0)s" in query
+    assert params['r0_c0'] == 'p1'
+    assert params['r1_c2'] == '2025-06-27T02:00:00-04:00'
+    assert params['r1_c4'] is None
+
+
+def test_insert_drive_records_serializes_miscellaneous_dict(fake_client, drive_config):
+    miscellaneous = {'source_query': {'index': 'logs-*'}, 'tags': ['backfill']}
+    records = [
+        _record('p1', '2025-06-27T00:00:00-04:00', '2025-06-27T01:00:00-04:00', miscellaneous),
+        _record('p2', '2025-06-27T01:00:00-04:00', '2025-06-27T02:00:00-04:00'),
+    ]
+
+    insert_drive_records(records, drive_config)
+
+    query, params = fake_client.executed[0]
+    assert "SELECT $1, $2, $3, $4, PARSE_JSON($5)" in query
+    assert json.loads(params['r0_c4']) == miscellaneous
+    assert params['r1_c4'] is None
+
+
+def test_insert_drive_record_delegates_to_single_row_insert(fake_client, drive_config):
+    insert_drive_record(_record('p1', '2025-06-27T00:00:00-04:00', '2025-06-27T01:00:00-04:00', {'a': 1}), drive_config)
+
+    query, params = fake_client.executed[0]
+    assert "PARSE_JSON($5)" in query
+    assert params['r0_c4'] == '{"a": 1}'
+    assert 'r1_c0' not in params
+
+
+def test_insert_drive_records_without_records_sends_nothing(fake_client, drive_config):
+    assert insert_drive_records([], drive_config) == {"query_id": None, "rows_affected": 0}
+    assert fake_client.executed == []
+
+
+def test_lock_record_only_claims_pending_rows(fake_client, drive_config):
+    acquired = lock_record_for_processing('p1', 'manual__1', drive_config, PIPELINE_START_TIME='2025-06-27T10:00:00Z')
+
+    assert acquired is True
+    query, params = fake_client.executed[0]
+    assert "SET PIPELINE_STATUS = 'IN_PROGRESS'" in query
+    assert "AND PIPELINE_STATUS = 'PENDING'" in query
+    assert params == {'PIPELINE_ID': 'p1', 'DAG_RUN_ID': 'manual__1', 'PIPELINE_START_TIME': '2025-06-27T10:00:00Z'}
+
+
+def test_lock_record_reports_lost_race_when_no_row_matches(fake_client, drive_config):
+    # Another run already moved the record out of PENDING, so the conditional UPDATE touches nothing
+    fake_client.rows_affected = 0
+
+    assert lock_record_for_processing('p1', 'manual__2', drive_config) is False
+    assert fake_client.executed[0][1]['PIPELINE_START_TIME'] is not None
@@ -1,237 +1,192 @@
 # test_record_generator.py
 
 import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'pipeline_framework'))
+import pytest
 
 from rich.table import Table
 from rich import print as rprint
-from records_generation.record_generator import record_generator
-from utils.time_utility import to_iso_string, get_current_time_iso
+from pipeline_framework import record_generator as record_generator_module
+from pipeline_framework.record_generator import (
+    record_generator, parse_time_string, parse_time_strings, seconds_to_time_string
+)
+from pipeline_framework.utils.time_utility import to_iso_string
 
 # Your utility functions
-def print_records_with_highlight(records, highlight_keys):
+def print_records_with_highlight(records, highlight_keys, columns=None):
     if not records:
         rprint("[red]No records to display[/red]")
         return
+    highlight_set = frozenset(highlight_keys)
+    if columns is None:
+        columns = list(records[0].keys())
     table = Table(show_header=True, header_style="bold cyan")
-    for key in records[0].keys():
+    for key in columns:
         table.add_column(key)
-    for record in records:
-        row = []
-        for key in record:
-            val = str(record[key])
-            if key in highlight_keys:
-                val = f"[green]{val}[/green]"
-            row.append(val)
+    rows = [
+        [f"[green]{record.get(key)}[/green]" if key in highlight_set else str(record.get(key)) for key in columns]
+        for record in records
+    ]
+    for row in rows:
         table.add_row(*row)
     rprint(table)
 
+def to_display_records(records):
+    """Convert *_TIME values to ISO column by column (one pass per column), then rebuild rows for printing"""
+    if not records:
+        return []
+    columns = {key: [record.get(key) for record in records] for key in records[0]}
+    for key, values in columns.items():
+        if key.endswith('_TIME'):
+            columns[key] = [to_iso_string(value) if value is not None else None for value in values]
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
 # Mock context for Airflow
 class MockTaskInstance:
+    def __init__(self):
+        self.xcom = {}
+
     def xcom_push(self, key, value):
+        self.xcom[key] = value
         print(f"XCom Push - {key}: {value}")
 
 class MockContext:
     def __init__(self):
         self.task_instance = MockTaskInstance()
 
-# Updated final_config with new schema
-final_config = {
-    "x_time_back": "1d",
-    "granularity": "2h", 
-    "timezone": "America/New_York",
-    "drive_table_default_record": {
-        "source_id": None,
-        "source_name": "elasticsearch",
-        "source_category": "search_engine",
-        "source_sub_category": "document_store",
-        
-        "stage_id": None,
-        "stage_name": "aws_s3",
-        "stage_category": "cloud_storage",
-        "stage_sub_category": "object_storage",
-        
-        "target_id": None,
-        "target_name": "snowflake",
-        "target_category": "data_warehouse",
-        "target_sub_category": "cloud_warehouse",
-        
-        "source_to_stage_ingestion_start_time": None,
-        "source_to_stage_ingestion_end_time": None,
-        "source_to_stage_ingestion_status": "PENDING",
-        
-        "stage_to_target_ingestion_start_time": None,
-        "stage_to_target_ingestion_end_time": None,
-        "stage_to_target_ingestion_status": "PENDING",
-        
-        "audit_start_time": None,
-        "audit_end_time": None,
-        "audit_status": "PENDING",
-        
-        "pipeline_id": None,
-        "pipeline_start_time": None,
-        "pipeline_end_time": None,
-        "pipeline_status": "PENDING",
-        
-        "dag_run_id": None,
-        "audit_result": None,
-        "completed_phase": None,
-        "retry_attempt": 0,
-        "granularity": None,
-        "window_start_time": None,
-        "window_end_time": None,
-        "target_day": None,
-        "miscellaneous": None,
-        "record_first_created_time": None,
-        "record_last_updated_time": None
-    }
-}
-
-# Test data for existing records (using ISO strings)
-existing_records_sample = [
-    {
-        'window_start_time': '2025-06-27T02:00:00-04:00',
-        'window_end_time': '2025-06-27T04:00:00-04:00',
-        'pipeline_id': 'abc123_test',
-        'source_id': 'src_test_1',
-        'stage_id': 'stg_test_1',
-        'target_id': 'tgt_test_1'
-    },
-    {
-        'window_start_time': '2025-06-27T04:00:00-04:00', 
-        'window_end_time': '2025-06-27T06:00:00-04:00',
-        'pipeline_id': 'abc123_test',
-        'source_id': 'src_test_2',
-        'stage_id': 'stg_test_2',
-        'target_id': 'tgt_test_2'
-    }
-]
-
-def test_case_1():
-    """Test Case 1: No existing records"""
-    print("\n=== TEST CASE 1: No Existing Records ===")
-    
-    import records_generation.record_generator as rg
-    rg.get_existing_records = lambda config, day: []
-    
-    created_records = []
-    
-    def mock_insert(record, config):
-        # Convert any non-string timestamps to ISO for display
-        display_record = record.copy()
-        for key, value in display_record.items():
-            if key.endswith('_time') and value is not None:
-                display_record[key] = to_iso_string(value)
-        created_records.append(display_record)
-        print(f"✅ Record inserted: {record['pipeline_id']}")
-    
-    rg.insert_record = mock_insert
-    
-    context = MockContext()
-    result = record_generator(final_config, **{'task_instance': context.task_instance})
-    
-    print(f"Return value: {result}")
-    print_records_with_highlight(created_records, ['window_start_time', 'window_end_time', 'pipeline_id', 'granularity', 'source_id', 'stage_id', 'target_id'])
+# Fixed "now" for every run: TARGET_DAY (now - 1d) is 2025-06-27
+NOW_ISO = '2025-06-28T10:00:00-04:00'
+TARGET_DAY_END = '2025-06-28T00:00:00-04:00'
 
-def test_case_2():
-    """Test Case 2: Existing records present"""
-    print("\n=== TEST CASE 2: Existing Records Present ===")
-    
-    import records_generation.record_generator as rg
-    rg.get_existing_records = lambda config, day: existing_records_sample
-    
-    created_records = []
-    
-    def mock_insert(record, config):
-        # Convert any non-string timestamps to ISO for display
-        display_record = record.copy()
-        for key, value in display_record.items():
-            if key.endswith('_time') and value is not None:
-                display_record[key] = to_iso_string(value)
-        created_records.append(display_record)
-        print(f"✅ Record inserted: {record['pipeline_id']}")
-    
-    rg.insert_record = mock_insert
+
+@pytest.fixture
+def insert_calls():
+    """One entry (the list of records) per insert_drive_records call"""
+    return []
+
+
+@pytest.fixture
+def mocked_rg(monkeypatch, insert_calls):
+    """Patch record_generator's clock and drive-table I/O: no existing records by default, inserts are collected"""
+    import pipeline_framework.record_generator as rg
+    
+    def mock_insert_drive_records(records, config):
+        insert_calls.append(list(records))
+        for record in records:
+            print(f"✅ Record inserted: {record['PIPELINE_ID']}")
+        return {"query_id": "test", "rows_affected": len(records)}
+    
+    monkeypatch.setattr(rg, 'get_current_time_iso', lambda timezone="UTC": NOW_ISO)
+    monkeypatch.setattr(rg, 'get_existing_drive_records', lambda config, day: None)
+    monkeypatch.setattr(rg, 'insert_drive_records', mock_insert_drive_records)
+    return rg
+
+
+def use_existing_records(monkeypatch, rg, existing):
+    """Serve MAX(WINDOW_END_TIME) of the given drive records, as get_existing_drive_records does"""
+    max_end_time = max((record['WINDOW_END_TIME'] for record in existing), default=None)
+    monkeypatch.setattr(rg, 'get_existing_drive_records', lambda config, day: max_end_time)
+
+
+# Scenarios name their conftest fixtures, so test data is only built for the tests that run
+@pytest.mark.parametrize("config_fixture,existing_fixture,label,expected_window,expected_granularity", [
+    ("final_config", None, "No Existing Records",
+     ('2025-06-27T00:00:00-04:00', '2025-06-27T02:00:00-04:00'), '2h'),
+    ("final_config", "existing_records_sample", "Existing Records Present",
+     ('2025-06-27T06:00:00-04:00', '2025-06-27T08:00:00-04:00'), '2h'),
+    ("boundary_config", "boundary_records", "Boundary Capping",
+     ('2025-06-27T22:00:00-04:00', TARGET_DAY_END), '2h'),
+    ("short_config", "short_records", "Short Remaining Time",
+     ('2025-06-27T23:30:00-04:00', TARGET_DAY_END), '30m'),
+], ids=["no_existing", "existing", "boundary_capping", "short_remaining"])
+def test_record_generator(request, mocked_rg, monkeypatch, insert_calls, config_fixture, existing_fixture, label,
+                          expected_window, expected_granularity):
+    print(f"\n=== {label} ===")
+    cfg = request.getfixturevalue(config_fixture)
+    existing = request.getfixturevalue(existing_fixture) if existing_fixture else []
+    use_existing_records(monkeypatch, mocked_rg, existing)
     
     context = MockContext()
-    result = record_generator(final_config, **{'task_instance': context.task_instance})
+    result = record_generator(cfg, **{'task_instance': context.task_instance})
     
     print(f"Return value: {result}")
-    print("\nExisting records:")
-    print_records_with_highlight(existing_records_sample, ['window_start_time', 'window_end_time', 'pipeline_id'])
-    print("\nNew record created:")
-    print_records_with_highlight(created_records, ['window_start_time', 'window_end_time', 'pipeline_id', 'granularity', 'source_id', 'stage_id', 'target_id'])
+    if existing:
+        print(f"\n{label} - Existing records:")
+        print_records_with_highlight(existing, ['WINDOW_START_TIME', 'WINDOW_END_TIME', 'PIPELINE_ID'])
+    created_records = [record for records in insert_calls for record in records]
+    print(f"\n{label} - New records:")
+    print_records_with_highlight(to_display_records(created_records), ['WINDOW_START_TIME', 'WINDOW_END_TIME', 'PIPELINE_ID', 'GRANULARITY', 'SOURCE_ID', 'STAGE_ID', 'TARGET_ID'],
+                                 columns=list(cfg['drive_table_default_record']))
+    
+    assert result == 1
+    assert context.task_instance.xcom == {'generated_count': 1}
+    assert len(insert_calls) == 1
+    [record] = insert_calls[0]
+    assert (record['WINDOW_START_TIME'], record['WINDOW_END_TIME']) == expected_window
+    assert record['GRANULARITY'] == expected_granularity
+    assert record['TARGET_DAY'] == '2025-06-27'
+    assert set(record) >= set(cfg['drive_table_default_record'])
+    assert all(key.isupper() for key in record)
+    assert record['STAGE_SUB_CATEGORY'] == f"s3://data-lake-bucket/raw/logs/2025-06-27/{expected_window[0][11:16].replace(':', '-')}/"
+    assert record['PIPELINE_ID'] and record['PIPELINE_ID'] not in {r['PIPELINE_ID'] for r in existing}
 
-def test_boundary_cases():
-    """Test corner cases with boundary conditions"""
-    
-    # Test Case 3: Boundary capping
-    print("\n=== TEST CASE 3: Boundary Capping ===")
-    
-    boundary_records = [
-        {
-            'window_start_time': '2025-06-27T22:00:00-04:00',
-            'window_end_time': '2025-06-27T22:00:00-04:00',
-            'pipeline_id': 'boundary_test_1',
-            'source_id': 'src_boundary',
-            'stage_id': 'stg_boundary',
-            'target_id': 'tgt_boundary'
-        }
-    ]
-    
-    boundary_config = final_config.copy()
-    boundary_config['granularity'] = '4h'
-    
-    test_with_config_and_records(boundary_config, boundary_records, "Boundary Capping")
-    
-    # Test Case 4: Very short remaining time  
-    print("\n=== TEST CASE 4: Short Remaining Time ===")
-    
-    short_records = [
-        {
-            'window_start_time': '2025-06-27T23:30:00-04:00',
-            'window_end_time': '2025-06-27T23:30:00-04:00',
-            'pipeline_id': 'short_test_1',
-            'source_id': 'src_short',
-            'stage_id': 'stg_short',
-            'target_id': 'tgt_short'
-        }
+
+def test_record_generator_inserts_records_per_run_windows_in_one_call(mocked_rg, insert_calls, final_config):
+    context = MockContext()
+    result = record_generator({**final_config, 'records_per_run': 3}, task_instance=context.task_instance)
+    
+    assert result == 3
+    assert context.task_instance.xcom == {'generated_count': 3}
+    assert len(insert_calls) == 1
+    windows = [(record['WINDOW_START_TIME'], record['WINDOW_END_TIME']) for record in insert_calls[0]]
+    assert windows == [
+        ('2025-06-27T00:00:00-04:00', '2025-06-27T02:00:00-04:00'),
+        ('2025-06-27T02:00:00-04:00', '2025-06-27T04:00:00-04:00'),
+        ('2025-06-27T04:00:00-04:00', '2025-06-27T06:00:00-04:00'),
     ]
-    
-    short_config = final_config.copy()
-    short_config['granularity'] = '2h'
-    
-    test_with_config_and_records(short_config, short_records, "Short Time")
+    assert len({record['PIPELINE_ID'] for record in insert_calls[0]}) == 3
 
-def test_with_config_and_records(config, existing_records, test_name):
-    """Helper function to test with specific config and records"""
-    import records_generation.record_generator as rg
-    rg.get_existing_records = lambda cfg, day: existing_records
-    
-    created_records = []
-    
-    def mock_insert(record, cfg):
-        # Convert any non-string timestamps to ISO for display
-        display_record = record.copy()
-        for key, value in display_record.items():
-            if key.endswith('_time') and value is not None:
-                display_record[key] = to_iso_string(value)
-        created_records.append(display_record)
-        print(f"✅ Record inserted: {record['pipeline_id']}")
-    
-    rg.insert_record = mock_insert
+
+def test_record_generator_stops_at_target_day_end(mocked_rg, monkeypatch, insert_calls, short_config, short_records):
+    use_existing_records(monkeypatch, mocked_rg, short_records)
+    context = MockContext()
+    result = record_generator({**short_config, 'records_per_run': 5}, task_instance=context.task_instance)
     
+    assert result == 1
+    assert [record['WINDOW_END_TIME'] for record in insert_calls[0]] == [TARGET_DAY_END]
+
+
+def test_record_generator_past_target_day_inserts_nothing(mocked_rg, monkeypatch, insert_calls, final_config):
+    monkeypatch.setattr(mocked_rg, 'get_existing_drive_records', lambda config, day: TARGET_DAY_END)
     context = MockContext()
-    result = record_generator(config, **{'task_instance': context.task_instance})
+    result = record_generator(final_config, task_instance=context.task_instance)
     
-    print(f"Return value: {result}")
-    print(f"\n{test_name} - Existing records:")
-    print_records_with_highlight(existing_records, ['window_start_time', 'window_end_time', 'pipeline_id'])
-    print(f"\n{test_name} - New record:")
-    print_records_with_highlight(created_records, ['window_start_time', 'window_end_time', 'granularity', 'source_id', 'stage_id', 'target_id'])
+    assert result == 0
+    assert context.task_instance.xcom == {'generated_count': 0}
+    assert insert_calls == []
+
+@pytest.mark.parametrize("time_str,seconds", [
+    ("1d", 86400), ("2h", 7200), ("1d2h30m", 95400), ("1W", 604800), ("30s", 30), ("", 0), (None, 0),
+])
+def test_parse_time_string(time_str, seconds):
+    assert parse_time_string(time_str) == seconds
+
+
+def test_seconds_to_time_string_round_trips():
+    assert seconds_to_time_string(95400) == "1d2h30m"
+    assert parse_time_string(seconds_to_time_string(95400)) == 95400
+    assert seconds_to_time_string(0) == "0s"
+
+
+def test_parse_time_strings_keeps_input_order():
+    assert parse_time_strings(["2h", "1d", "30s"]) == [7200, 86400, 30]
+
+
+def test_parse_time_strings_parses_each_distinct_string_once(monkeypatch):
+    parsed = []
+    monkeypatch.setattr(record_generator_module, 'parse_time_string',
+                        lambda time_str: parsed.append(time_str) or len(time_str))
+    assert parse_time_strings(["1d", "2h", "1d", "1d", "2h"]) == [2, 2, 2, 2, 2]
+    assert parsed == ["1d", "2h"]
 
 if __name__ == "__main__":
-    test_case_1()
-    test_case_2()
-    test_boundary_cases()
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-s"]))
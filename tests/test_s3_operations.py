@@ -0,0 +1,48 @@
+# test_s3_operations.py
+
+import pytest
+
+from pipeline_framework import s3_operations
+from pipeline_framework.record_generator import build_stage_uri
+
+
+def test_stage_prefix_must_end_with_slash():
+    assert s3_operations._get_bucket_prefix({'STAGE_SUB_CATEGORY': 's3://bucket/raw/2025-06-27/10-00/'}) == \
+        ('bucket', 'raw/2025-06-27/10-00/')
+    with pytest.raises(ValueError):
+        s3_operations._get_bucket_prefix({'STAGE_SUB_CATEGORY': 's3://bucket/raw/2025-06-27/10-00'})
+
+
+def test_build_stage_uri_normalizes_slashes():
+    config = {'s3_bucket': 'bucket', 's3_prefix_list': ['raw/', '/logs', '']}
+    assert build_stage_uri(config, '2025-06-27', '10-00') == 's3://bucket/raw/logs/2025-06-27/10-00/'
+
+
+PREFIX = 'raw/2025-06-27/10-00/'
+RECORD = {'PIPELINE_ID': 'p1', 'STAGE_SUB_CATEGORY': f's3://bucket/{PREFIX}'}
+S3_CONFIG = {'aws_access_key_id': 'key', 'aws_secret_access_key': 'secret', 'aws_region': 'us-east-1'}
+
+
+@pytest.fixture
+def fake_s3(monkeypatch, fake_s3):
+    monkeypatch.setattr(s3_operations, '_get_s3_client', lambda cred_tuple: fake_s3)
+    return fake_s3
+
+
+def test_exists_check_after_count_sees_objects_written_since(fake_s3):
+    assert s3_operations.s3_count(S3_CONFIG, RECORD) == 0
+    assert s3_operations.s3_check_exists(S3_CONFIG, RECORD) is False
+
+    fake_s3.add('bucket', PREFIX + 'part-0.json')
+
+    assert s3_operations.s3_check_exists(S3_CONFIG, RECORD) is True
+
+
+def test_delete_after_count_removes_objects_written_since(fake_s3):
+    fake_s3.add('bucket', PREFIX + 'part-0.json', PREFIX + 'shard-a/part-1.json')
+    assert s3_operations.s3_count(S3_CONFIG, RECORD) == 2
+
+    fake_s3.add('bucket', PREFIX + 'part-2.json', PREFIX + 'shard-b/part-3.json')
+    s3_operations.s3_delete(S3_CONFIG, RECORD)
+
+    assert fake_s3.objects == {}
@@ -0,0 +1,77 @@
+# test_s3_to_snowflake.py
+
+import asyncio
+import pytest
+
+RECORD = {'PIPELINE_ID': 'p1'}
+
+
+@pytest.fixture
+def s3_to_snowflake(import_with_stub_retry):
+    return import_with_stub_retry('pipeline_framework.s3_to_snowflake')
+
+
+@pytest.fixture
+def sleeps(monkeypatch, s3_to_snowflake):
+    """Record the backoff delays instead of sleeping"""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(s3_to_snowflake.asyncio, 'sleep', fake_sleep)
+    return delays
+
+
+def use_counts(monkeypatch, s3_to_snowflake, expected, loaded_sequence):
+    loaded = iter(loaded_sequence)
+    monkeypatch.setattr(s3_to_snowflake, 'source_count', lambda final_config, record: expected)
+    monkeypatch.setattr(s3_to_snowflake, 'snowflake_count', lambda final_config, record: next(loaded))
+
+
+def test_wait_backs_off_until_target_count_reaches_source(monkeypatch, s3_to_snowflake, sleeps):
+    use_counts(monkeypatch, s3_to_snowflake, expected=10, loaded_sequence=[0, 4, 9, 10])
+
+    assert asyncio.run(s3_to_snowflake.wait_for_snowpipe_load({}, RECORD)) is True
+    assert sleeps == [5, 7.5, 11.25]
+
+
+def test_wait_gives_up_at_max_wait_with_a_capped_last_delay(monkeypatch, s3_to_snowflake, sleeps):
+    use_counts(monkeypatch, s3_to_snowflake, expected=10, loaded_sequence=[0] * 10)
+
+    assert asyncio.run(s3_to_snowflake.wait_for_snowpipe_load({'snowpipe_max_wait_seconds': 15}, RECORD)) is False
+    assert sleeps == [5, 7.5, 2.5]
+
+
+@pytest.fixture
+def transfers(monkeypatch, s3_to_snowflake):
+    """Fake the Snowflake task (PIPELINE_ID 'bad' fails) and a snowpipe wait that finishes at once"""
+    def fake_execute(final_config, record):
+        if record['PIPELINE_ID'] == 'bad':
+            raise RuntimeError("task failed")
+        return True
+
+    async def fake_wait(final_config, record):
+        return True
+
+    monkeypatch.setattr(s3_to_snowflake, 'execute_snowflake_task', fake_execute)
+    monkeypatch.setattr(s3_to_snowflake, 'wait_for_snowpipe_load', fake_wait)
+    return s3_to_snowflake
+
+
+def test_records_transfer_returns_failures_without_cancelling_the_rest(transfers):
+    config = {'snowflake_task_name': 'LOAD_TASK'}
+    records = [{'PIPELINE_ID': 'p1'}, {'PIPELINE_ID': 'bad'}, {'PIPELINE_ID': 'p3'}]
+
+    results = asyncio.run(transfers.transfer_records_s3_to_snowflake_async(config, records))
+
+    assert results[0] is True and results[2] is True
+    assert isinstance(results[1], RuntimeError)
+
+
+def test_sync_transfer_raises_the_async_failure(transfers):
+    config = {'snowflake_task_name': 'LOAD_TASK'}
+
+    assert transfers.transfer_s3_to_snowflake(config, {'PIPELINE_ID': 'p1'}) is True
+    with pytest.raises(RuntimeError, match="task failed"):
+        transfers.transfer_s3_to_snowflake(config, {'PIPELINE_ID': 'bad'})
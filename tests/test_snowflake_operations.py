@@ -0,0 +1,62 @@
+# test_snowflake_operations.py
+
+import pytest
+
+from pipeline_framework.snowflake_operations import snowflake_delete
+
+RECORD = {'PIPELINE_ID': 'p1', 'TARGET_SUB_CATEGORY': 'raw/2025-06-27/10-00/%'}
+
+
+@pytest.fixture
+def target_config():
+    return {
+        'snowflake_account': 'acct', 'snowflake_user': 'user', 'snowflake_password': 'pw',
+        'snowflake_role': 'role', 'snowflake_warehouse': 'wh',
+        'target_database': 'RAW_DATA', 'target_schema': 'LOGS', 'target_table': 'APPLICATION_LOGS',
+        'timezone': 'UTC'
+    }
+
+
+def use_rows(fake_client, rows):
+    """The window holds `rows` rows: the LIMIT 1 probe finds one when rows > 0 and the DELETE removes them all"""
+    fake_client.scalar = 1 if rows else None
+    fake_client.rows_affected = rows
+
+
+def statement_kinds(fake_client):
+    return ['delete' if query.strip().startswith('DELETE') else 'probe' for query, _ in fake_client.executed]
+
+
+def test_delete_probes_before_deleting(fake_client, target_config):
+    use_rows(fake_client, rows=3)
+
+    assert snowflake_delete(target_config, RECORD) is True
+    assert statement_kinds(fake_client) == ['probe', 'delete']
+
+
+def test_delete_skips_statement_when_window_is_empty(fake_client, target_config):
+    use_rows(fake_client, rows=0)
+
+    assert snowflake_delete(target_config, RECORD) is True
+    assert statement_kinds(fake_client) == ['probe']
+
+
+def test_delete_with_known_exists_does_not_probe_again(fake_client, target_config):
+    use_rows(fake_client, rows=3)
+
+    snowflake_delete(target_config, RECORD, known_exists=True)
+    assert statement_kinds(fake_client) == ['delete']
+
+    fake_client.executed.clear()
+    snowflake_delete(target_config, RECORD, known_exists=False)
+    assert fake_client.executed == []
+
+
+def test_stage_to_target_precleanup_probes_once(monkeypatch, fake_client, target_config, import_with_stub_retry):
+    stage_to_target = import_with_stub_retry('pipeline_framework.stage_to_target')
+    use_rows(fake_client, rows=3)
+    monkeypatch.setattr(stage_to_target, 'transfer_s3_to_snowflake', lambda final_config, record: True)
+    monkeypatch.setattr(stage_to_target, 'finalize_record', lambda *args, **kwargs: None)
+
+    assert stage_to_target.transfer(target_config, dict(RECORD)) is True
+    assert statement_kinds(fake_client) == ['probe', 'delete']
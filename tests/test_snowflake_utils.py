@@ -0,0 +1,146 @@
+# test_snowflake_utils.py
+
+import subprocess
+import sys
+import os
+import pytest
+
+from pipeline_framework.utils import snowflake_utils
+from pipeline_framework.utils.snowflake_utils import SnowflakeQueryClient
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+CREDS = {'account': 'acct', 'user': 'user', 'password': 'pw', 'role': 'role', 'warehouse': 'wh'}
+CONFIG = {'database': 'DB', 'schema': 'SCH', 'table': 'DRIVE'}
+
+
+def test_import_does_not_load_pandas_or_connector():
+    code = (
+        "import sys\n"
+        "import pipeline_framework.drive_record_adapter\n"
+        "import pipeline_framework.record_generator\n"
+        "print(sorted(m for m in ('pandas', 'pyarrow', 'snowflake.connector') if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+
+def test_clients_with_same_identity_share_one_pooled_connection(connect_calls):
+    with SnowflakeQueryClient(CREDS, CONFIG) as first:
+        first.execute_scalar_query("SELECT 1")
+    with SnowflakeQueryClient(CREDS, {**CONFIG, 'table': 'OTHER'}) as second:
+        second.execute_scalar_query("SELECT 1")
+
+    assert len(connect_calls) == 1
+    assert connect_calls[0]['login_timeout'] == 15
+
+    with SnowflakeQueryClient(CREDS, {**CONFIG, 'schema': 'OTHER'}) as third:
+        third.execute_scalar_query("SELECT 1")
+    assert len(connect_calls) == 2
+
+
+def test_drain_pool_closes_released_connections(connect_calls):
+    with SnowflakeQueryClient(CREDS, CONFIG) as client:
+        connection = client.get_connection()
+    assert not connection.closed
+
+    snowflake_utils._drain_pool()
+    assert connection.closed
+
+
+def test_pool_key_covers_every_connect_argument(connect_calls):
+    with SnowflakeQueryClient(CREDS, CONFIG) as client:
+        client.get_connection()
+    with SnowflakeQueryClient({**CREDS, 'password': 'rotated'}, CONFIG) as client:
+        client.get_connection()
+    with SnowflakeQueryClient({**CREDS, 'authenticator': 'externalbrowser'}, CONFIG) as client:
+        client.get_connection()
+
+    assert [call['password'] for call in connect_calls] == ['pw', 'rotated', 'pw']
+    assert connect_calls[2]['authenticator'] == 'externalbrowser'
+    assert 'authenticator' not in connect_calls[0]
+
+
+def test_close_connection_closes_and_evicts_the_pooled_connection(connect_calls):
+    client = SnowflakeQueryClient(CREDS, CONFIG)
+    connection = client.get_connection()
+
+    client.close_connection()
+    assert connection.closed
+    assert client.connection is None
+
+    with SnowflakeQueryClient(CREDS, CONFIG) as other:
+        assert other.get_connection() is not connection
+    assert len(connect_calls) == 2
+
+
+def test_insert_one_record_only_binds_record_fields(connect_calls):
+    with SnowflakeQueryClient(CREDS, CONFIG) as client:
+        result = client.insert_one_record_only({'PIPELINE_ID': 'abc', 'RETRY_ATTEMPT': 0})
+        query, params = client.get_connection().executed[-1]
+
+    assert query == "INSERT INTO DRIVE (PIPELINE_ID, RETRY_ATTEMPT) VALUES (%(PIPELINE_ID)s, %(RETRY_ATTEMPT)s)"
+    assert params == {'PIPELINE_ID': 'abc', 'RETRY_ATTEMPT': 0}
+    assert result == {'query_id': 'qid-1', 'num_rows_inserted': 1}
+
+
+class BatchCursor:
+    """Cursor double returning preset result chunks from the connector's batch fetch methods"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    def fetch_arrow_batches(self):
+        return iter(self.chunks)
+
+    def fetch_pandas_batches(self):
+        return iter(self.chunks)
+
+    def close(self):
+        self.closed = True
+
+
+def test_fetch_arrow_batches_streams_record_batches(monkeypatch):
+    pa = pytest.importorskip('pyarrow')
+    tables = [
+        pa.table({'ID': [1, 2], 'NAME': ['a', 'b']}),
+        pa.table({'ID': [3], 'NAME': ['c']}),
+    ]
+    cursor = BatchCursor(tables)
+    client = SnowflakeQueryClient(CREDS, CONFIG)
+    monkeypatch.setattr(client, '_execute_query', lambda query, params=None: (cursor, 'qid-1'))
+
+    batches = list(client.fetch_arrow_batches("SELECT ID, NAME FROM DRIVE"))
+
+    assert all(isinstance(batch, pa.RecordBatch) for batch in batches)
+    assert [row for batch in batches for row in snowflake_utils.tuples_from_arrow(batch)] == \
+        [(1, 'a'), (2, 'b'), (3, 'c')]
+    assert cursor.closed
+
+
+def test_iter_dataframe_batches_closes_cursor_when_caller_stops_early(monkeypatch):
+    pd = pytest.importorskip('pandas')
+    frames = [pd.DataFrame({'ID': [1, 2]}), pd.DataFrame({'ID': [3]})]
+    cursor = BatchCursor(frames)
+    client = SnowflakeQueryClient(CREDS, CONFIG)
+    monkeypatch.setattr(client, '_execute_query', lambda query, params=None: (cursor, 'qid-1'))
+
+    batches = client.iter_dataframe_batches("SELECT ID FROM DRIVE")
+    assert next(batches) is frames[0]
+    assert not cursor.closed
+
+    batches.close()
+    assert cursor.closed
+
+
+def test_iter_dataframe_batches_yields_every_chunk(monkeypatch):
+    pd = pytest.importorskip('pandas')
+    frames = [pd.DataFrame({'ID': [1, 2]}), pd.DataFrame({'ID': [3]})]
+    cursor = BatchCursor(frames)
+    client = SnowflakeQueryClient(CREDS, CONFIG)
+    monkeypatch.setattr(client, '_execute_query', lambda query, params=None: (cursor, 'qid-1'))
+
+    batches = list(client.iter_dataframe_batches("SELECT ID FROM DRIVE"))
+    assert len(batches) == len(frames) and all(got is want for got, want in zip(batches, frames))
+    assert cursor.closed
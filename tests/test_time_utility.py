@@ -0,0 +1,47 @@
+# test_time_utility.py
+
+import pendulum
+import pytest
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+from pipeline_framework.utils.time_utility import (
+    to_iso_string, add_duration_to_iso, subtract_duration_from_iso, compare_times, convert_timezone
+)
+
+
+@pytest.mark.parametrize("tzinfo, expected", [
+    (timezone.utc, '2025-01-10T08:00:00Z'),
+    (ZoneInfo('UTC'), '2025-01-10T08:00:00Z'),
+    (ZoneInfo('Europe/London'), '2025-01-10T08:00:00+00:00'),
+    (ZoneInfo('Etc/UTC'), '2025-01-10T08:00:00+00:00'),
+    (ZoneInfo('America/New_York'), '2025-01-10T08:00:00-05:00'),
+])
+def test_aware_datetime_matches_pendulum_formatting(tzinfo, expected):
+    dt = datetime(2025, 1, 10, 8, tzinfo=tzinfo)
+
+    assert to_iso_string(dt) == expected
+    assert to_iso_string(dt) == pendulum.instance(dt).to_iso8601_string()
+
+
+def test_naive_datetime_is_read_in_given_timezone():
+    assert to_iso_string(datetime(2025, 6, 27, 8), 'America/New_York') == '2025-06-27T08:00:00-04:00'
+    assert to_iso_string(datetime(2025, 6, 27, 8)) == '2025-06-27T08:00:00Z'
+
+
+def test_iso_string_passes_through_unchanged():
+    assert to_iso_string('2025-01-10T08:00:00+00:00') == '2025-01-10T08:00:00+00:00'
+    assert to_iso_string('2025-01-10T08:00:00Z') == '2025-01-10T08:00:00Z'
+
+
+def test_duration_arithmetic_keeps_source_offset_spelling():
+    assert add_duration_to_iso('2025-01-10T08:00:00Z', 3600) == '2025-01-10T09:00:00Z'
+    assert add_duration_to_iso('2025-01-10T08:00:00+00:00', 3600) == '2025-01-10T09:00:00+00:00'
+    assert subtract_duration_from_iso('2025-06-27T01:00:00-04:00', 7200) == '2025-06-26T23:00:00-04:00'
+
+
+def test_compare_and_convert_across_offsets():
+    assert compare_times('2025-01-10T08:00:00Z', '2025-01-10T03:00:00-05:00') == 0
+    assert compare_times('2025-01-10T08:00:00Z', '2025-01-10T08:00:01Z') == -1
+    assert convert_timezone('2025-01-10T08:00:00Z', 'Europe/London') == '2025-01-10T08:00:00+00:00'
+    assert convert_timezone('2025-01-10T13:00:00+05:00', 'UTC') == '2025-01-10T08:00:00Z'
@@ -0,0 +1,56 @@
+# test_xcom_s3_backend.py
+
+import json
+import pytest
+
+pytest.importorskip('airflow')
+
+from pipeline_framework import xcom_s3_backend
+from pipeline_framework.xcom_s3_backend import S3XComBackend
+
+XCOM_KWARGS = {'key': 'records', 'task_id': 'generate', 'dag_id': 'app_logs', 'run_id': 'manual__1', 'map_index': -1}
+OBJECT_KEY = 'xcom/app_logs/manual__1/generate/records.json'
+
+
+class StoredXCom:
+    """Stands in for the XCom row: only .value is read when deserializing"""
+
+    def __init__(self, value):
+        self.value = value
+
+
+@pytest.fixture
+def fake_s3(monkeypatch, fake_s3):
+    monkeypatch.setattr(xcom_s3_backend, '_get_s3_client', lambda: fake_s3)
+    monkeypatch.setattr(xcom_s3_backend, '_XCOM_S3_BUCKET', 'xcom-bucket')
+    monkeypatch.setattr(xcom_s3_backend, '_XCOM_S3_MIN_BYTES', 100)
+    return fake_s3
+
+
+def test_small_values_stay_in_the_database(fake_s3):
+    stored = S3XComBackend.serialize_value({'PIPELINE_ID': 'p1'}, **XCOM_KWARGS)
+
+    assert fake_s3.objects == {}
+    assert json.loads(stored) == {'PIPELINE_ID': 'p1'}
+    assert S3XComBackend.deserialize_value(StoredXCom(stored)) == {'PIPELINE_ID': 'p1'}
+
+
+def test_large_values_are_offloaded_and_read_back(fake_s3):
+    records = [{'PIPELINE_ID': f'p{i}', 'WINDOW_START_TIME': '2025-06-27T00:00:00Z'} for i in range(10)]
+
+    stored = S3XComBackend.serialize_value(records, **XCOM_KWARGS)
+
+    assert json.loads(stored) == {'_ref': f's3://xcom-bucket/{OBJECT_KEY}'}
+    assert json.loads(fake_s3.objects[('xcom-bucket', OBJECT_KEY)]) == records
+    assert S3XComBackend.deserialize_value(StoredXCom(stored)) == records
+
+
+def test_purge_deletes_offloaded_object_only(fake_s3):
+    large = S3XComBackend.serialize_value(['x' * 200], **XCOM_KWARGS)
+    small = S3XComBackend.serialize_value(['x'], **XCOM_KWARGS)
+
+    S3XComBackend.purge(StoredXCom(small), session=None)
+    assert ('xcom-bucket', OBJECT_KEY) in fake_s3.objects
+
+    S3XComBackend.purge(StoredXCom(large), session=None)
+    assert fake_s3.objects == {}